@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Synthetic Cursor data for benchmarks.
+
+Builds a fake ~/.cursor/projects tree (agent-transcripts in the same text format Cursor
+writes) and a workspaceStorage tree with a workspace.json per project.
+
+Usage:
+  python bench_corpus.py /tmp/corpus                         # 20 projects x 10 sessions
+  python bench_corpus.py /tmp/corpus --projects 200 --sessions 50 --turns 40
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import quote
+
+_ASSISTANT_LINES = [
+    "Let me look at the file first.",
+    "I'll update the function and add a check for the empty case.",
+    "Done. The tests pass now.",
+    "The error comes from the config loader; fixing it.",
+    "Here is what changed and why.",
+]
+_REQUESTS = [
+    "fix the failing test in {name}",
+    "add a --verbose flag to {name}",
+    "refactor {name} so it does not read the file twice",
+    "why does {name} crash on empty input?",
+    "write docs for {name}",
+]
+
+
+def _code_lines(rng: random.Random, n: int) -> str:
+    return "\n".join(f"    value_{i} = compute({i}, {rng.randint(0, 999)})" for i in range(n))
+
+
+def transcript(
+    rng: random.Random,
+    turns: int,
+    fence_rate: float = 0.4,
+    tool_rate: float = 0.4,
+    think_rate: float = 0.5,
+    code_lines: int = 20,
+) -> str:
+    """One transcript with `turns` user turns, each followed by 1-3 assistant blocks."""
+    out = []
+    for t in range(turns):
+        name = f"module_{rng.randint(0, 50)}.py"
+        out.append("user:\n")
+        if rng.random() < 0.2:
+            out.append(f"<attached_files>\n{name}\n</attached_files>\n")
+        out.append(f"<user_query>\n{rng.choice(_REQUESTS).format(name=name)}\n</user_query>\n\n")
+        for _ in range(rng.randint(1, 3)):
+            out.append("assistant:\n")
+            if rng.random() < think_rate:
+                out.append(f"<think>\nThe user wants turn {t} done; check {name} first.\n</think>\n")
+            out.append(rng.choice(_ASSISTANT_LINES) + "\n")
+            if rng.random() < fence_rate:
+                out.append(f"```python\ndef f():\n{_code_lines(rng, code_lines)}\n```\n")
+            if rng.random() < tool_rate:
+                out.append(
+                    f"[Tool call] Write\n  path: /src/{name}\n  contents: import os\n"
+                    f"{_code_lines(rng, code_lines)}\n\n[Tool result] Write\n"
+                )
+            if rng.random() < tool_rate / 2:
+                out.append(
+                    f"[Tool call] StrReplace\n  path: /src/{name}\n  old_string: a = 1\nb = 2\n"
+                    f"  new_string: a = 2\nb = 3\n\n[Tool result] StrReplace\n"
+                )
+            out.append("\n")
+    return "".join(out)
+
+
+def large_transcripts(rng: random.Random, chars: int) -> dict[str, str]:
+    """
+    Single transcripts of about `chars` characters for parser benchmarks: a realistic one,
+    and two that used to make the parser rescan the rest of the file (an unclosed
+    <user_query> before many "\n<user_query>" turns, and many unclosed <think> tags).
+    """
+    realistic = []
+    size = 0
+    while size < chars:
+        realistic.append(transcript(rng, 20))
+        size += len(realistic[-1])
+    unclosed_query = "user:\n<user_query>\n" + "\n<user_query>\nfix it\nassistant:\nok" * (chars // 32)
+    unclosed_think = (
+        "user:\n<user_query>\nq\n</user_query>\nassistant:\n" + "<think>\nhmm\n" * (chars // 12)
+    )
+    return {
+        "realistic": "".join(realistic),
+        "unclosed_user_query": unclosed_query,
+        "unclosed_think": unclosed_think,
+    }
+
+
+def generate_corpus(
+    root: Path,
+    projects: int = 20,
+    sessions: int = 10,
+    turns: int = 20,
+    fence_rate: float = 0.4,
+    tool_rate: float = 0.4,
+    think_rate: float = 0.5,
+    code_lines: int = 20,
+    days: int = 3,
+    report_date: datetime | None = None,
+    seed: int = 1,
+) -> dict:
+    """
+    Write root/projects/<slug>/agent-transcripts/*.txt and root/workspaceStorage/<id>/workspace.json.
+    Transcript mtimes are spread over the `days` days ending on report_date (default: today),
+    between 4:00 and 23:00, so the newest day matches the default 3:00 - 1:00 work window.
+    Returns counts: projects, files, bytes.
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    report_date = (report_date or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    projects_root = root / "projects"
+    ws_root = root / "workspaceStorage"
+    files = 0
+    total_bytes = 0
+    for p in range(projects):
+        folder = f"/home/bench/project {p}" if p % 5 == 0 else f"/home/bench/project-{p}"
+        slug = folder.strip("/").replace("/", "-")
+        transcripts_dir = projects_root / slug / "agent-transcripts"
+        transcripts_dir.mkdir(parents=True, exist_ok=True)
+        ws_dir = ws_root / hashlib.md5(folder.encode("utf-8")).hexdigest()
+        ws_dir.mkdir(parents=True, exist_ok=True)
+        (ws_dir / "workspace.json").write_text(
+            json.dumps({"folder": "file://" + quote(folder)}), encoding="utf-8"
+        )
+        for s in range(sessions):
+            txt_file = transcripts_dir / f"{p:04d}-{s:04d}-bench.txt"
+            data = transcript(
+                rng, rng.randint(1, turns), fence_rate, tool_rate, think_rate, code_lines
+            ).encode("utf-8")
+            txt_file.write_bytes(data)
+            when = report_date - timedelta(days=rng.randrange(days)) + timedelta(
+                seconds=rng.randint(4 * 3600, 23 * 3600)
+            )
+            os.utime(txt_file, (when.timestamp(), when.timestamp()))
+            files += 1
+            total_bytes += len(data)
+    return {"projects": projects, "files": files, "bytes": total_bytes}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic Cursor transcript corpus.")
+    parser.add_argument("root", help="Output folder (gets projects/ and workspaceStorage/).")
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=10, help="Transcripts per project.")
+    parser.add_argument("--turns", type=int, default=20, help="Max user turns per transcript.")
+    parser.add_argument("--fence-rate", type=float, default=0.4,
+                        help="Chance an assistant block has a code fence.")
+    parser.add_argument("--tool-rate", type=float, default=0.4,
+                        help="Chance an assistant block has a Write tool call.")
+    parser.add_argument("--think-rate", type=float, default=0.5,
+                        help="Chance an assistant block has a <think> block.")
+    parser.add_argument("--code-lines", type=int, default=20,
+                        help="Lines per code fence / tool call body.")
+    parser.add_argument("--days", type=int, default=3, help="Spread mtimes over this many days.")
+    parser.add_argument("--date", default=None, help="Newest day YYYY-MM-DD (default: today).")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    report_date = None
+    if args.date:
+        try:
+            report_date = datetime.strptime(args.date, "%Y-%m-%d")
+        except ValueError:
+            print("Invalid --date. Use YYYY-MM-DD.")
+            return
+    stats = generate_corpus(
+        Path(args.root),
+        projects=args.projects,
+        sessions=args.sessions,
+        turns=args.turns,
+        fence_rate=args.fence_rate,
+        tool_rate=args.tool_rate,
+        think_rate=args.think_rate,
+        code_lines=args.code_lines,
+        days=args.days,
+        report_date=report_date,
+        seed=args.seed,
+    )
+    print(f"{stats['files']} transcripts in {stats['projects']} projects, "
+          f"{stats['bytes'] / 1e6:.1f} MB -> {args.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark cursor_daily_report.py on synthetic corpora (see bench_corpus.py).
+
+Times workspace resolution, transcript collection, parsing (also of single large and
+pathological transcripts), assistant cleanup and report building at several corpus sizes
+and writes the results as JSON, so two versions can be compared with --compare.
+
+Usage:
+  python bench_report.py                                  # small + medium
+  python bench_report.py --sizes small,medium,large --repeat 5
+  python bench_report.py --output new.json --compare old.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import bench_corpus
+import cursor_daily_report as cdr
+
+# Corpus presets: arguments for bench_corpus.generate_corpus.
+SIZES = {
+    "small": {"projects": 5, "sessions": 5, "turns": 10},
+    "medium": {"projects": 20, "sessions": 20, "turns": 20},
+    "large": {"projects": 60, "sessions": 40, "turns": 40},
+}
+# Characters of each single large transcript in the parser stages (bench_corpus.large_transcripts).
+LARGE_FILE_CHARS = {"small": 200_000, "medium": 1_000_000, "large": 5_000_000}
+# --compare flags stages whose median grew by more than this ratio and this many seconds.
+REGRESSION_RATIO = 1.2
+REGRESSION_MIN_S = 0.001
+
+
+def _time_runs(fn, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return {"min_s": min(runs), "median_s": statistics.median(runs), "runs": runs}
+
+
+def _point_at(root: Path) -> None:
+    """Make cursor_daily_report read the corpus under root and keep its caches there too."""
+    cdr.CURSOR_PROJECTS = root / "projects"
+    cdr.CURSOR_WS_STORAGE = root / "workspaceStorage"
+    cdr.CACHE_DIR = root / "cache"
+    cdr.PARSE_CACHE_DIR = cdr.CACHE_DIR / "transcripts"
+    cdr.WORKSPACE_INDEX_PATH = cdr.CACHE_DIR / "workspace-index.json"
+    cdr.SCAN_MANIFEST_PATH = cdr.CACHE_DIR / "scan-manifest.json"
+
+
+def bench_size(root: Path, corpus_args: dict, repeat: int, large_file_chars: int = 0) -> dict:
+    """
+    Generate one corpus under root and time every stage on it, plus parsing single
+    transcripts of large_file_chars characters (if set).
+    """
+    report_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    corpus = bench_corpus.generate_corpus(root, report_date=report_date, **corpus_args)
+    _point_at(root)
+
+    files = sorted(cdr.CURSOR_PROJECTS.glob("*/agent-transcripts/*.txt"))
+    contents = [f.read_text(encoding="utf-8") for f in files]
+    assistant = [
+        c for text in contents for r, c in cdr.parse_transcript_full(text) if r == "assistant"
+    ]
+
+    timings = {
+        "get_workspace_paths": _time_runs(lambda: cdr.get_workspace_paths(use_cache=False), repeat),
+        "get_workspace_paths_cached": _time_runs(cdr.get_workspace_paths, repeat),
+        "collect_transcripts": _time_runs(
+            lambda: cdr.collect_transcripts(report_date, use_cache=False), repeat
+        ),
+        "collect_transcripts_cached": _time_runs(
+            lambda: cdr.collect_transcripts(report_date), repeat
+        ),
+        "parse_transcript_full": _time_runs(
+            lambda: [cdr.parse_transcript_full(text) for text in contents], repeat
+        ),
+        "_clean_assistant_content": _time_runs(
+            lambda: [cdr._clean_assistant_content(text) for text in assistant], repeat
+        ),
+        "build_report_compact": _time_runs(
+            lambda: cdr.build_report(report_date, 3, 1, compact=True, use_cache=False), repeat
+        ),
+        "build_report_full": _time_runs(
+            lambda: cdr.build_report(report_date, 3, 1, compact=False, use_cache=False), repeat
+        ),
+    }
+    if large_file_chars:
+        large = bench_corpus.large_transcripts(random.Random(1), large_file_chars)
+        for name, text in large.items():
+            timings[f"parse_large_{name}"] = _time_runs(
+                lambda text=text: cdr.parse_transcript_full(text), repeat
+            )
+        corpus["large_file_chars"] = large_file_chars
+    corpus["assistant_blocks"] = len(assistant)
+    return {"corpus": {**corpus_args, **corpus}, "timings": timings}
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent, capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(old: dict, new: dict) -> list[str]:
+    """Table lines of median time new/old per size and stage, with regressions marked."""
+    lines = [f"{'size':<8} {'stage':<32} {'old s':>9} {'new s':>9} {'ratio':>7}"]
+    for size, result in new["sizes"].items():
+        old_timings = old.get("sizes", {}).get(size, {}).get("timings", {})
+        for stage, t in result["timings"].items():
+            if stage not in old_timings:
+                continue
+            old_s = old_timings[stage]["median_s"]
+            new_s = t["median_s"]
+            ratio = new_s / old_s if old_s else float("inf")
+            slower = ratio > REGRESSION_RATIO and new_s - old_s > REGRESSION_MIN_S
+            flag = "  <- slower" if slower else ""
+            lines.append(f"{size:<8} {stage:<32} {old_s:>9.4f} {new_s:>9.4f} {ratio:>7.2f}{flag}")
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Cursor daily report.")
+    parser.add_argument(
+        "--sizes",
+        default="small,medium",
+        help=f"Comma-separated corpus sizes ({', '.join(SIZES)}). Default: small,medium.",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage (default: 3).")
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Results JSON (default: bench-results/bench-YYYYmmdd-HHMMSS.json).",
+    )
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to compare against.")
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown or not sizes:
+        print(f"Unknown size(s): {', '.join(unknown)}. Use: {', '.join(SIZES)}.")
+        return
+    if args.repeat < 1:
+        print("--repeat must be at least 1.")
+        return
+
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "sizes": {},
+    }
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix=f"cursor-bench-{size}-") as tmp:
+            result = bench_size(Path(tmp), SIZES[size], args.repeat, LARGE_FILE_CHARS[size])
+        results["sizes"][size] = result
+        corpus = result["corpus"]
+        print(f"{size}: {corpus['files']} transcripts, {corpus['bytes'] / 1e6:.1f} MB")
+        for stage, t in result["timings"].items():
+            print(f"  {stage:<32} {t['median_s']:.4f} s (min {t['min_s']:.4f})")
+
+    out_path = Path(args.output) if args.output else (
+        Path(__file__).resolve().parent / "bench-results"
+        / f"bench-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Results saved: {out_path}")
+
+    if args.compare:
+        try:
+            old = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"Could not read {args.compare}: {e}")
+            return
+        print("\n".join(compare(old, results)))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,14 +10,29 @@ Usage:
   python cursor_daily_report.py                    # report for "today" (3 AM - 1 AM)
   python cursor_daily_report.py --date 2026-01-30 # report for that day
   python cursor_daily_report.py --start 0 --end 24 # full calendar day
+  python cursor_daily_report.py --from 2026-01-01 --to 2026-01-31  # one report per day
+  python cursor_daily_report.py --dedupe            # list repeated requests once, with a count
+  python cursor_daily_report.py --jsonl sessions.jsonl   # also export the sessions as JSON lines
+  python cursor_daily_report.py --input sessions.jsonl   # report from an export, no transcripts
+  python cursor_daily_report.py --delta             # only turns not in an earlier day's report
+  python cursor_daily_report.py --watch             # keep today's report up to date (Ctrl-C)
 """
 
 import argparse
+import hashlib
+import json
 import os
 import re
 import sys
+import time
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+from urllib.parse import unquote
+
+from message_dedupe import group_duplicates
+from report_stats import CHARS_PER_TOKEN, STATS, add_stats_argument, write_stats
 
 
 def _cursor_projects_root() -> Path:
@@ -39,6 +54,38 @@ def _cursor_workspace_storage() -> Path:
 CURSOR_PROJECTS = _cursor_projects_root()
 CURSOR_WS_STORAGE = _cursor_workspace_storage()
 
+# Local cache of parsed transcripts (see load_transcript_turns) and workspace folders.
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+PARSE_CACHE_DIR = CACHE_DIR / "transcripts"
+WORKSPACE_INDEX_PATH = CACHE_DIR / "workspace-index.json"
+# Per agent-transcripts directory: its mtime and the last seen mtime of each transcript.
+SCAN_MANIFEST_PATH = CACHE_DIR / "scan-manifest.json"
+# --delta: per session_id, the turn count and content hash of each report date (see delta_rows).
+SNAPSHOT_PATH = CACHE_DIR / "report-snapshots.json"
+# Snapshot entries of report dates older than this many days are dropped, except each
+# session's latest one before that (see prune_snapshots).
+SNAPSHOT_MAX_AGE_DAYS = 30
+# A directory listing is only reused if the directory mtime was this far before the scan that
+# listed it (a file created in the same timestamp tick would not change the mtime).
+_SCAN_MTIME_SLACK_NS = 2_000_000_000
+# Bump whenever parse_transcript_full output or the cache entry layout changes, so old cache
+# entries are ignored.
+PARSER_VERSION = 2
+# Cache entries not used for this many days are deleted.
+PARSE_CACHE_MAX_AGE_DAYS = 30
+# Bytes at the start of a transcript and just before the resume offset that must be unchanged
+# for incremental parsing; otherwise the file was rewritten and is parsed from scratch.
+RESUME_CHECK_BYTES = 4096
+# Bytes before the resume offset given back to the parser (it looks back 30 chars for "assistant:").
+_RESUME_LOOKBACK_BYTES = 128
+
+# Streaming mode (see iter_transcript_turns): transcripts at least this large are read in
+# chunks of STREAM_CHUNK_CHARS and their turns are not kept in memory.
+STREAM_MIN_BYTES = 1 << 20
+STREAM_CHUNK_CHARS = 1 << 20
+# Text kept before the resume position when the stream buffer is trimmed.
+_STREAM_LOOKBACK_CHARS = 64
+
 
 def slug_to_path(slug: str) -> str:
     """Convert project slug to absolute path (e.g. home-mohammadreza-cursor -> /home/mohammadreza/cursor)."""
@@ -50,26 +97,77 @@ def path_to_display_name(slug: str) -> str:
     return slug.split("-")[-1] if "-" in slug else slug
 
 
-def get_workspace_paths() -> dict[str, str]:
-    """Build slug -> folder path from workspaceStorage workspace.json files."""
+def _workspace_folder(workspace_json: Path) -> str | None:
+    """Local folder of a workspace.json ("folder": "file://..." URL, percent-decoded), or None."""
+    data = json.loads(workspace_json.read_text(encoding="utf-8", errors="replace"))
+    folder = data.get("folder") if isinstance(data, dict) else None
+    if not isinstance(folder, str) or not folder.startswith("file://"):
+        return None
+    return unquote(folder[len("file://") :]).rstrip("/") or None
+
+
+def _read_cache_json(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_cache_json(path: Path, data: dict) -> None:
+    """Write a small cache file atomically; failures are ignored (the cache is optional)."""
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def get_workspace_paths(
+    use_cache: bool = True,
+    workspace_storage: Path | None = None,
+    index_path: Path | None = None,
+) -> dict[str, str]:
+    """
+    Build slug -> folder path from workspaceStorage workspace.json files (workspace_storage,
+    default CURSOR_WS_STORAGE).
+    With use_cache, the folder of each workspace directory is kept in index_path (default
+    WORKSPACE_INDEX_PATH) and workspace.json is only read again for directories whose mtime
+    changed.
+    """
+    workspace_storage = workspace_storage or CURSOR_WS_STORAGE
+    index_path = index_path or WORKSPACE_INDEX_PATH
     out = {}
-    if not CURSOR_WS_STORAGE.exists():
+    if not workspace_storage.exists():
         return out
-    for ws_dir in CURSOR_WS_STORAGE.iterdir():
-        if not ws_dir.is_dir():
-            continue
-        wj = ws_dir / "workspace.json"
-        if not wj.exists():
-            continue
-        try:
-            raw = wj.read_text()
-            m = re.search(r'"folder"\s*:\s*"file://([^"]+)"', raw)
-            if m:
-                path = m.group(1).rstrip("/")
+    index = _read_cache_json(index_path) if use_cache else {}
+    new_index: dict[str, dict] = {}
+    with os.scandir(workspace_storage) as it:
+        for ws_dir in it:
+            try:
+                if not ws_dir.is_dir():
+                    continue
+                mtime_ns = ws_dir.stat().st_mtime_ns
+            except OSError:
+                continue
+            STATS.count("workspace_dirs")
+            known = index.get(ws_dir.name)
+            if isinstance(known, dict) and known.get("mtime_ns") == mtime_ns:
+                path = known.get("path")
+            else:
+                STATS.count("workspace_json_read")
+                try:
+                    path = _workspace_folder(Path(ws_dir.path) / "workspace.json")
+                except Exception:
+                    path = None
+            new_index[ws_dir.name] = {"mtime_ns": mtime_ns, "path": path}
+            if path:
                 slug = path.strip("/").replace("/", "-")
                 out[slug] = path
-        except Exception:
-            pass
+    if use_cache and new_index != index:
+        _write_cache_json(index_path, new_index)
     return out
 
 
@@ -99,151 +197,767 @@ def parse_transcript_full(content: str) -> list[tuple[str, str]]:
     User turns can start with "user:\n" (then optional <attached_files>, then <user_query>)
     OR with "\n<user_query>" only (Cursor sometimes omits "user:\n" for later turns).
     """
-    turns: list[tuple[str, str]] = []
-    pos = 0
+    return _parse_turns(content)[0]
+
+
+def _parse_turns(content: str, pos: int = 0) -> tuple[list[tuple[str, str]], int, int]:
+    """
+    parse_transcript_full started at pos.
+    Also returns (resume_pos, resume_turns): where the first turn that may still change when
+    text is appended begins, and how many turns come before it. Parsing again from resume_pos
+    on the grown content yields the remaining turns.
+    """
+    spans, resume_pos, resume_turns = tokenize_transcript(content, pos)
+    return [_span_text(content, span) for span in spans], resume_pos, resume_turns
+
+
+# Role of user text not wrapped in <user_query> (plain "user:\n" block); truncated like a paste.
+_PLAIN_USER = "user:plain"
+_PLAIN_USER_MAX_CHARS = 2000
+
+_THINK_OPEN_RE = re.compile(r"<think>", re.IGNORECASE)
+_THINK_CLOSE_RE = re.compile(r"</think>", re.IGNORECASE)
+_NON_SPACE_RE = re.compile(r"\S")
+
+
+def _span_text(content: str, span: tuple[str, int, int]) -> tuple[str, str]:
+    """(role, text) turn for a tokenize_transcript span."""
+    role, start, end = span
+    text = content[start:end].strip()
+    if role == _PLAIN_USER:
+        role = "user"
+        if len(text) > _PLAIN_USER_MAX_CHARS:
+            text = text[:_PLAIN_USER_MAX_CHARS] + "\n… [truncated]"
+    return role, text
+
+
+def _next_line(content: str, pos: int) -> int:
+    """Start of the line after pos (end of content if pos is on the last line)."""
+    end = content.find("\n", pos)
+    return len(content) if end == -1 else end + 1
+
+
+def _marker_finder(content: str, marker: str):
+    """
+    content.find(marker, pos) that remembers its last answer. Turn boundaries are searched
+    with mostly increasing pos, so each marker scans the text about once in total, and a
+    missing marker (e.g. an unclosed <user_query>) is not searched for again and again.
+    """
+    start: int | None = None
+    found = -1
+
+    def find(pos: int) -> int:
+        nonlocal start, found
+        if start is None or pos < start or (found != -1 and pos > found):
+            start, found = pos, content.find(marker, pos)
+        return found
+
+    return find
+
+
+def tokenize_transcript(content: str, pos: int = 0) -> tuple[list[tuple[str, int, int]], int, int]:
+    """
+    Split a transcript (from pos) into (role, start, end) spans in one forward pass;
+    content[start:end].strip() is the turn text (see _span_text). Only non-empty turns are
+    returned. Also returns (resume_pos, resume_turns) as described in _parse_turns.
+    """
+    n = len(content)
+    find_user_line = _marker_finder(content, "user:\n")
+    find_nl_user_line = _marker_finder(content, "\nuser:\n")
+    find_query_tag = _marker_finder(content, "\n<user_query>")
+    find_query_open = _marker_finder(content, "<user_query>")
+    find_query_close = _marker_finder(content, "</user_query>")
+    find_assistant = _marker_finder(content, "\nassistant:")
+
+    spans: list[tuple[str, int, int]] = []
+    resume_pos, resume_turns = pos, 0
+    complete = True
 
-    while pos < len(content):
-        # Next user turn: either "\nuser:\n" or "\n<user_query>" (or "user:\n" at start)
-        at_start = pos == 0
-        find_user_line = content.find("user:\n", pos)
-        if at_start and content.startswith("user:\n"):
-            find_user_line = 0
-        find_query_tag = content.find("\n<user_query>", pos)
-        # Pick earliest valid start
-        next_user_line = find_user_line if find_user_line != -1 else len(content)
-        next_query_tag = find_query_tag if find_query_tag != -1 else len(content)
-        if at_start and find_user_line == 0:
-            turn_start = 0
+    def add(role: str, start: int, end: int) -> None:
+        if _NON_SPACE_RE.search(content, start, end):
+            spans.append((role, start, end))
+
+    while pos < n:
+        if complete:
+            resume_pos, resume_turns = pos, len(spans)
+        # Next user turn: either "user:\n" or "\n<user_query>"
+        next_user_line = find_user_line(pos)
+        next_query_tag = find_query_tag(pos)
+        if next_user_line == -1:
+            next_user_line = n
+        if next_query_tag == -1:
+            next_query_tag = n
+        if pos == 0 and next_user_line == 0:
+            user_start = 0
             use_query_only = False
         elif next_user_line <= next_query_tag:
-            if next_user_line >= len(content):
+            if next_user_line >= n:
                 break
-            allowed = (next_user_line == 0 or
-                       "assistant:" in content[max(0, next_user_line - 30) : next_user_line])
-            if not allowed:
+            # A later "user:\n" only starts a turn right after an "assistant:" line.
+            if "assistant:" not in content[max(0, next_user_line - 30) : next_user_line]:
                 pos = next_user_line + 1
                 continue
-            turn_start = next_user_line + 1  # after "\n", so at "user"
+            user_start = next_user_line + 1
             use_query_only = False
         else:
-            turn_start = next_query_tag + 2  # after "\n<", so at "user_query>"
             use_query_only = True
 
         if use_query_only:
-            q_open = turn_start - 1  # "\n<user_query>": "<" at turn_start-1
-            q_content_start = content.find("\n", q_open) + 1
-            q_end = content.find("</user_query>", q_content_start)
-            next_asst = content.find("\nassistant:", q_content_start)
-            if q_end != -1:
-                user_content = content[q_content_start:q_end].strip()
-            else:
-                user_content = (content[q_content_start:next_asst].strip()
-                                if next_asst != -1 else content[q_content_start:].strip())
+            q_open = next_query_tag + 1
+            q_content_start = _next_line(content, q_open)
+            q_end = find_query_close(q_content_start)
+            next_asst = find_assistant(q_content_start)
+            user_closed = q_end != -1
+            if not user_closed:
+                q_end = next_asst if next_asst != -1 else n
+            add("user", q_content_start, q_end)
             user_start_for_asst = q_open
         else:
-            user_start = turn_start
-            q_open = content.find("<user_query>", user_start)
-            next_asst = content.find("\nassistant:", user_start)
+            q_open = find_query_open(user_start)
+            next_asst = find_assistant(user_start)
             if q_open != -1 and (next_asst == -1 or q_open < next_asst):
-                q_content_start = content.find("\n", q_open) + 1
-                q_end = content.find("</user_query>", q_content_start)
-                if q_end != -1:
-                    user_content = content[q_content_start:q_end].strip()
-                else:
-                    user_content = (content[q_content_start:next_asst].strip()
-                                    if next_asst != -1 else content[q_content_start:].strip())
+                q_content_start = _next_line(content, q_open)
+                q_end = find_query_close(q_content_start)
+                user_closed = q_end != -1
+                if not user_closed:
+                    q_end = next_asst if next_asst != -1 else n
+                add("user", q_content_start, q_end)
             else:
-                user_content_start = user_start + 6  # len("user:\n")
-                user_content = (content[user_content_start:next_asst].strip()
-                               if next_asst != -1 else content[user_content_start:].strip())
-                if len(user_content) > 2000:
-                    user_content = user_content[:2000] + "\n… [truncated]"
+                user_closed = True
+                add(_PLAIN_USER, user_start + 6, next_asst if next_asst != -1 else n)
             user_start_for_asst = user_start
 
-        if user_content:
-            turns.append(("user", user_content))
-        asst_start = content.find("\nassistant:", user_start_for_asst)
+        asst_start = find_assistant(user_start_for_asst)
         if asst_start == -1:
             break
-        asst_content_start = content.find("\n", asst_start + 1) + 1
-        next_user_line = content.find("\nuser:\n", asst_content_start)
-        next_query_tag = content.find("\n<user_query>", asst_content_start)
-        next_user = next_user_line if next_user_line != -1 else len(content)
-        if next_query_tag != -1 and next_query_tag < next_user:
-            next_user = next_query_tag
-        if next_user >= len(content):
-            asst_raw = content[asst_content_start:].strip()
-        else:
-            asst_raw = content[asst_content_start:next_user].strip()
-        think = re.search(r"<think>\s*.*?\s*</think>", asst_raw, re.DOTALL | re.IGNORECASE)
-        if think:
-            visible = asst_raw[think.end() :].strip()
-        else:
-            visible = asst_raw
-        if visible:
-            turns.append(("assistant", visible))
-        pos = asst_content_start if next_user >= len(content) else next_user
+        asst_content_start = _next_line(content, asst_start + 1)
+        next_user = n
+        for find in (find_nl_user_line, find_query_tag):
+            found = find(asst_content_start)
+            if found != -1 and found < next_user:
+                next_user = found
+        # Visible answer starts after the first complete <think>...</think> block, if any.
+        visible_start = asst_content_start
+        think_open = _THINK_OPEN_RE.search(content, asst_content_start, next_user)
+        if think_open:
+            think_close = _THINK_CLOSE_RE.search(content, think_open.end(), next_user)
+            if think_close:
+                visible_start = think_close.end()
+        add("assistant", visible_start, next_user)
+        # A turn is final once the next user turn has started; the last one may still grow.
+        # An unclosed <user_query> is not: a "</user_query>" appended later would extend it.
+        # Turns after a non-final one are never checkpointed either.
+        complete = complete and next_user < n and user_closed
+        pos = asst_content_start if next_user >= n else next_user
 
-    return turns
+    return spans, resume_pos, resume_turns
 
 
-def in_work_window(mtime: datetime, report_date: datetime, start_hour: int, end_hour: int) -> bool:
+def _parse_cache_entry_path(txt_file: Path) -> Path:
+    """Cache file for a transcript: one JSON file per transcript path."""
+    key = hashlib.sha1(str(txt_file).encode("utf-8")).hexdigest()
+    return PARSE_CACHE_DIR / f"{key}.json"
+
+
+def _read_parse_cache(txt_file: Path) -> dict | None:
+    try:
+        entry = json.loads(_parse_cache_entry_path(txt_file).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get("path") != str(txt_file):
+        return None
+    return entry
+
+
+def _write_parse_cache(
+    txt_file: Path,
+    st: os.stat_result,
+    turns: list[tuple[str, str]],
+    offsets: list[tuple[int, int]],
+    resume: dict | None,
+) -> None:
+    entry = {
+        "path": str(txt_file),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "version": PARSER_VERSION,
+        "turns": turns,
+        "offsets": offsets,
+        "resume": resume,
+    }
+    entry_path = _parse_cache_entry_path(txt_file)
+    tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, entry_path)
+    except OSError:
+        pass
+
+
+def _decode_transcript(raw: bytes) -> str:
+    """Same text as Path.read_text(encoding="utf-8", errors="replace") (universal newlines)."""
+    text = raw.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _resume_state(head: bytes, before: bytes, offset: int, turns: int, chars: int = 0) -> dict:
+    """
+    Resume state for incremental parsing: byte offset of the parser's resume position, the
+    number of turns before it, its character offset in the text, and a hash of the first
+    bytes of the file plus the bytes just before the offset (head/before may be longer; they
+    are trimmed here).
+    """
+    check = hashlib.sha1(
+        head[: min(offset, RESUME_CHECK_BYTES)] + b"\0" + before[-RESUME_CHECK_BYTES:]
+    ).hexdigest()
+    return {"offset": offset, "turns": turns, "chars": chars, "check": check}
+
+
+class TranscriptTurns(list):
+    """
+    Parsed (role, text) turns of one transcript, with the file they came from and each turn's
+    (start, end) character offsets in its text (see iter_transcript_spans).
+    """
+
+    def __init__(
+        self,
+        turns: Iterable[tuple[str, str]] = (),
+        txt_file: Path | None = None,
+        offsets: list[tuple[int, int]] | None = None,
+    ):
+        super().__init__(turns)
+        self.txt_file = txt_file
+        self.offsets = offsets
+
+
+def _spans_to_turns(
+    content: str, spans: list[tuple[str, int, int]], base: int = 0
+) -> tuple[list[tuple[str, str]], list[tuple[int, int]]]:
+    """Turns of tokenize_transcript spans, and their offsets shifted by base."""
+    return (
+        [_span_text(content, span) for span in spans],
+        [(base + start, base + end) for _, start, end in spans],
+    )
+
+
+def parse_transcript_appended(
+    txt_file: Path,
+    st: os.stat_result,
+    entry: dict,
+) -> tuple[list[tuple[str, str]], list[tuple[int, int]], dict | None] | None:
+    """
+    Incremental parse of a transcript that grew since it was cached: keep the cached turns
+    before the saved resume offset and parse only the bytes after it.
+    Returns (turns, their character offsets, new_resume_state), or None when a full parse is
+    needed (no resume state, file truncated or rewritten, or CRLF text).
+    """
+    resume = entry.get("resume")
+    if not resume or entry.get("version") != PARSER_VERSION:
+        return None
+    if st.st_size < entry.get("size", 0):
+        return None  # truncated
+    offset = resume["offset"]
+    with txt_file.open("rb") as f:
+        head = f.read(min(offset, RESUME_CHECK_BYTES))
+        start = max(0, offset - RESUME_CHECK_BYTES)
+        f.seek(start)
+        data = f.read()
+    STATS.count("bytes_read", len(head) + len(data))
+    before = data[: offset - start]
+    if len(before) != offset - start or _resume_state(head, before, offset, 0)["check"] != resume["check"]:
+        return None  # rewritten
+    tail = data[offset - start :]
+    if b"\r" in tail:
+        return None
+    lookback = before[-_RESUME_LOOKBACK_BYTES:].decode("utf-8", errors="replace")
+    text = lookback + tail.decode("utf-8", errors="replace")
+    spans, resume_pos, resume_turns = tokenize_transcript(text, len(lookback))
+    # The lookback may start inside a character; offsets count from the resume position.
+    new_turns, new_offsets = _spans_to_turns(text, spans, resume["chars"] - len(lookback))
+    kept = resume["turns"]
+    turns = [(role, content) for role, content in entry["turns"][:kept]] + new_turns
+    offsets = [(a, b) for a, b in entry["offsets"][:kept]] + new_offsets
+    if resume_pos == len(lookback):
+        return turns, offsets, resume
+    added = text[len(lookback) : resume_pos]
+    if "\ufffd" in added:
+        return turns, offsets, None
+    new_offset = offset + len(added.encode("utf-8"))
+    new_before = data[max(0, new_offset - RESUME_CHECK_BYTES) - start : new_offset - start]
+    new_head = head if start > 0 else data[:RESUME_CHECK_BYTES]
+    return turns, offsets, _resume_state(
+        new_head, new_before, new_offset, kept + resume_turns, resume["chars"] + len(added)
+    )
+
+
+def load_transcript_turns(
+    txt_file: Path,
+    st: os.stat_result,
+    use_cache: bool = True,
+) -> TranscriptTurns:
+    """
+    Parsed turns of one transcript, with txt_file and the turn offsets. With use_cache, the
+    result is stored under PARSE_CACHE_DIR keyed by (path, size, mtime, PARSER_VERSION) and
+    returned without re-reading on a hit.
+    A transcript that only grew since it was cached is parsed incrementally from the last
+    complete turn (see parse_transcript_appended).
     """
-    True if mtime falls in [report_date at start_hour, day_end).
+    entry = _read_parse_cache(txt_file) if use_cache else None
+    if entry is not None:
+        if (entry.get("size") == st.st_size
+                and entry.get("mtime_ns") == st.st_mtime_ns
+                and entry.get("version") == PARSER_VERSION):
+            try:
+                os.utime(_parse_cache_entry_path(txt_file))  # mark as recently used
+            except OSError:
+                pass
+            STATS.count("files_cache_hit")
+            return TranscriptTurns(
+                [(role, content) for role, content in entry["turns"]], txt_file,
+                [(start, end) for start, end in entry["offsets"]],
+            )
+        appended = parse_transcript_appended(txt_file, st, entry)
+        if appended is not None:
+            STATS.count("files_incremental")
+            turns, offsets, resume = appended
+            _write_parse_cache(txt_file, st, turns, offsets, resume)
+            return TranscriptTurns(turns, txt_file, offsets)
+    raw = txt_file.read_bytes()
+    STATS.count("files_parsed")
+    STATS.count("bytes_read", len(raw))
+    content = _decode_transcript(raw)
+    spans, resume_pos, resume_turns = tokenize_transcript(content)
+    turns, offsets = _spans_to_turns(content, spans)
+    if use_cache:
+        resume = None
+        if resume_pos and b"\r" not in raw and "\ufffd" not in content:
+            offset = len(content[:resume_pos].encode("utf-8"))
+            resume = _resume_state(
+                raw[:RESUME_CHECK_BYTES], raw[max(0, offset - RESUME_CHECK_BYTES) : offset],
+                offset, resume_turns, resume_pos,
+            )
+        _write_parse_cache(txt_file, st, turns, offsets, resume)
+    return TranscriptTurns(turns, txt_file, offsets)
+
+
+def evict_parse_cache(max_age_days: int = PARSE_CACHE_MAX_AGE_DAYS) -> int:
+    """Delete cache entries not used in max_age_days (e.g. deleted or long-idle sessions). Returns count."""
+    if not PARSE_CACHE_DIR.exists():
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    with os.scandir(PARSE_CACHE_DIR) as it:
+        for entry in it:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+    return removed
+
+
+def iter_transcript_turns(
+    txt_file: Path,
+    chunk_chars: int = STREAM_CHUNK_CHARS,
+) -> Iterator[tuple[str, str]]:
+    """
+    Yield the same turns as parse_transcript_full on the whole file, reading it in chunks.
+    Only the last, still unfinished turn is kept between chunks; if one turn is longer than
+    a chunk, the next read is twice as large.
+    """
+    for role, text, _, _ in iter_transcript_spans(txt_file, chunk_chars):
+        yield role, text
+
+
+def iter_transcript_spans(
+    txt_file: Path,
+    chunk_chars: int = STREAM_CHUNK_CHARS,
+) -> Iterator[tuple[str, str, int, int]]:
+    """
+    iter_transcript_turns with each turn's [start, end) character offsets in the transcript
+    text (as read with universal newlines): (role, text, start, end).
+    """
+    buf = ""
+    base = 0  # offset of buf[0] in the file
+    pos = 0
+    step = chunk_chars
+    with txt_file.open(encoding="utf-8", errors="replace") as f:
+        while True:
+            chunk = f.read(step)
+            buf += chunk
+            spans, resume_pos, resume_turns = tokenize_transcript(buf, pos)
+            if not chunk:
+                for span in spans:
+                    yield (*_span_text(buf, span), base + span[1], base + span[2])
+                return
+            for span in spans[:resume_turns]:
+                yield (*_span_text(buf, span), base + span[1], base + span[2])
+            if resume_pos > pos:
+                keep = max(0, resume_pos - _STREAM_LOOKBACK_CHARS)
+                buf, pos, step = buf[keep:], resume_pos - keep, chunk_chars
+                base += keep
+            else:
+                step *= 2
+
+
+class StreamedTurns:
+    """
+    Turns of a large transcript in streaming mode. Only the user messages and the turn count
+    are kept; iterating re-reads the file with iter_transcript_turns.
+    """
+
+    def __init__(self, txt_file: Path):
+        self.txt_file = txt_file
+        self.user_messages: list[str] = []
+        self.count = 0
+        for role, content in iter_transcript_turns(txt_file):
+            self.count += 1
+            if role == "user":
+                self.user_messages.append(content)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        return iter_transcript_turns(self.txt_file)
+
+
+def work_window(report_date: datetime, start_hour: int, end_hour: int) -> tuple[datetime, datetime]:
+    """
+    [day_start, day_end) of the work day for report_date.
     If start_hour > end_hour (e.g. 3 AM to 1 AM): day_end is next day at end_hour.
-    Otherwise (e.g. 9 to 17): day_end is same day at end_hour.
+    Otherwise (e.g. 9 to 17): day_end is same day at end_hour (24 = midnight).
     """
-    day_start = report_date.replace(hour=start_hour, minute=0, second=0, microsecond=0)
+    day = report_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    day_start = day + timedelta(hours=start_hour)
     if start_hour > end_hour:
-        day_end = (report_date + timedelta(days=1)).replace(
-            hour=end_hour, minute=0, second=0, microsecond=0
-        )
+        day_end = day + timedelta(days=1, hours=end_hour)
     else:
-        day_end = report_date.replace(
-            hour=end_hour, minute=0, second=0, microsecond=0
-        )
+        day_end = day + timedelta(hours=end_hour)
+    return day_start, day_end
+
+
+def in_work_window(mtime: datetime, report_date: datetime, start_hour: int, end_hour: int) -> bool:
+    """True if mtime falls in the work window of report_date (see work_window)."""
+    day_start, day_end = work_window(report_date, start_hour, end_hour)
     return day_start <= mtime < day_end
 
 
+def _load_turns_chunk(
+    files: list[tuple[Path, os.stat_result]],
+    use_cache: bool,
+) -> list[list[tuple[str, str]] | None]:
+    """Process-pool worker: parsed turns per file (None if the file could not be read)."""
+    out: list[list[tuple[str, str]] | None] = []
+    for txt_file, st in files:
+        t0 = time.perf_counter()
+        try:
+            out.append(load_transcript_turns(txt_file, st, use_cache=use_cache))
+        except Exception:
+            STATS.count("files_failed")
+            out.append(None)
+        STATS.file(txt_file, time.perf_counter() - t0, st.st_size)
+    return out
+
+
+def _load_turns_chunk_in_worker(
+    files: list[tuple[Path, os.stat_result]],
+    use_cache: bool,
+    stats_enabled: bool,
+) -> tuple[list[list[tuple[str, str]] | None], dict | None]:
+    """_load_turns_chunk in a pool process, plus that process's STATS for the parent to merge."""
+    STATS.enabled = stats_enabled
+    STATS.reset()  # a forked worker starts with a copy of the parent's numbers
+    with STATS.stage("parse (workers)"):
+        out = _load_turns_chunk(files, use_cache)
+    return out, STATS.drain()
+
+
+def _size_chunks(sizes: list[int], jobs: int) -> list[list[int]]:
+    """
+    Group file indexes into chunks of roughly equal total size (about 4 chunks per worker),
+    largest files first so a big transcript doesn't end up last in the queue.
+    """
+    target = max(1, sum(sizes) // (jobs * 4))
+    chunks: list[list[int]] = []
+    current: list[int] = []
+    current_size = 0
+    for i in sorted(range(len(sizes)), key=lambda i: -sizes[i]):
+        current.append(i)
+        current_size += sizes[i]
+        if current_size >= target:
+            chunks.append(current)
+            current, current_size = [], 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _load_all_turns(
+    files: list[tuple[Path, os.stat_result]],
+    use_cache: bool,
+    jobs: int,
+    streaming: bool = False,
+) -> list[list[tuple[str, str]] | StreamedTurns | None]:
+    """
+    Parsed turns for each file, in the same order as files; parsed in a process pool if jobs > 1.
+    With streaming, files of STREAM_MIN_BYTES or more become StreamedTurns (not cached).
+    """
+    results: list[list[tuple[str, str]] | StreamedTurns | None] = [None] * len(files)
+    pending: list[int] = []
+    for i, (txt_file, st) in enumerate(files):
+        if streaming and st.st_size >= STREAM_MIN_BYTES:
+            t0 = time.perf_counter()
+            try:
+                results[i] = StreamedTurns(txt_file)
+            except Exception:
+                STATS.count("files_failed")
+            else:
+                STATS.count("files_streamed")
+                STATS.count("bytes_read", st.st_size)
+            STATS.file(txt_file, time.perf_counter() - t0, st.st_size)
+        else:
+            pending.append(i)
+
+    if jobs <= 1 or len(pending) <= 1:
+        for i, turns in zip(pending, _load_turns_chunk([files[i] for i in pending], use_cache)):
+            results[i] = turns
+        return results
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = [
+        [pending[j] for j in chunk]
+        for chunk in _size_chunks([files[i][1].st_size for i in pending], jobs)
+    ]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+        futures = [
+            (
+                chunk,
+                pool.submit(
+                    _load_turns_chunk_in_worker, [files[i] for i in chunk], use_cache, STATS.enabled
+                ),
+            )
+            for chunk in chunks
+        ]
+        for chunk, future in futures:
+            chunk_results, worker_stats = future.result()
+            STATS.merge(worker_stats)
+            for i, turns in zip(chunk, chunk_results):
+                results[i] = turns
+    return results
+
+
 def collect_transcripts(
     report_date: datetime,
     start_hour: int = 3,
     end_hour: int = 1,
+    use_cache: bool = True,
+    jobs: int = 1,
+    streaming: bool = False,
+    projects_root: Path | None = None,
+    workspace_storage: Path | None = None,
+    cache_dir: Path | None = None,
 ) -> list[tuple[str, str, datetime, list[str], list[tuple[str, str]], str]]:
     """
     Returns list of (project_slug, project_path, last_modified, user_messages, full_turns, session_id).
+    Parsed transcripts are reused from the on-disk cache unless use_cache=False.
+    With jobs > 1, files are parsed in a process pool; the result order is the same as with jobs=1.
+    With streaming=True, full_turns of large transcripts is a StreamedTurns that reads the
+    file again when iterated, so memory does not grow with transcript size.
+    projects_root, workspace_storage and cache_dir read another Cursor tree (see
+    collect_transcripts_by_day).
     """
-    workspace_paths = get_workspace_paths()
-    results = []
+    return collect_transcripts_by_day(
+        [report_date], start_hour, end_hour, use_cache=use_cache, jobs=jobs, streaming=streaming,
+        projects_root=projects_root, workspace_storage=workspace_storage, cache_dir=cache_dir,
+    )[report_date]
+
 
+def iter_transcript_files() -> Iterator[tuple[str, Path, os.stat_result]]:
+    """(project slug, transcript path, stat) of every transcript under CURSOR_PROJECTS."""
     if not CURSOR_PROJECTS.exists():
-        return results
+        return
+    with os.scandir(CURSOR_PROJECTS) as projects:
+        for project_dir in projects:
+            if project_dir.name.startswith("tmp-"):
+                continue
+            transcripts_dir = os.path.join(project_dir.path, "agent-transcripts")
+            try:
+                with os.scandir(transcripts_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".txt") and entry.is_file():
+                            yield project_dir.name, Path(entry.path), entry.stat()
+            except OSError:
+                continue
 
-    for project_dir in CURSOR_PROJECTS.iterdir():
-        if not project_dir.is_dir():
-            continue
-        slug = project_dir.name
-        if slug.startswith("tmp-"):
-            continue
-        transcripts_dir = project_dir / "agent-transcripts"
-        if not transcripts_dir.exists():
-            continue
-        project_path = workspace_paths.get(slug) or slug_to_path(slug)
 
-        for txt_file in transcripts_dir.glob("*.txt"):
+def _outside_windows(mtime_ns: int, seen_ns: int, starts_ns: list[int], ends_ns: list[int]) -> bool:
+    """
+    True if a file that had mtime_ns when it was stat'ed at seen_ns cannot be in any of the
+    (sorted, non-overlapping) windows now. mtime only moves forward, so that holds when it was
+    already past every window, or was before the next window and untouched until the last ended.
+    """
+    j = bisect_right(ends_ns, mtime_ns)
+    if j == len(ends_ns):
+        return True
+    return mtime_ns < starts_ns[j] and seen_ns >= ends_ns[-1]
+
+
+def _scan_transcripts_dir(
+    transcripts_dir: str,
+    known: dict | None,
+    scan_ns: int,
+    starts_ns: list[int],
+    ends_ns: list[int],
+) -> tuple[dict, list[tuple[Path, os.stat_result]]]:
+    """
+    Stat the *.txt files of one agent-transcripts directory, skipping files that the scan
+    manifest entry `known` proves are outside every window (see _outside_windows).
+    If the directory mtime is unchanged, the file list comes from the manifest instead of
+    listing the directory, so an old project costs a single stat.
+    Returns (new manifest entry, [(path, stat)] for the files that were stat'ed).
+    """
+    dir_mtime_ns = os.stat(transcripts_dir).st_mtime_ns
+    known = known if isinstance(known, dict) else {}
+    old_files = known.get("files")
+    old_files = old_files if isinstance(old_files, dict) else {}
+    files: dict[str, list[int]] = {}
+    stated: list[tuple[Path, os.stat_result]] = []
+
+    seen_ns = known.get("seen_ns", 0)
+    if known.get("mtime_ns") == dir_mtime_ns and dir_mtime_ns + _SCAN_MTIME_SLACK_NS <= seen_ns:
+        # Same names as last time; only stat the files that might have moved into a window.
+        for name, rec in old_files.items():
+            if _outside_windows(rec[0], rec[1], starts_ns, ends_ns):
+                files[name] = rec
+                continue
+            path = os.path.join(transcripts_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files[name] = [st.st_mtime_ns, scan_ns, st.st_ino]
+            stated.append((Path(path), st))
+        STATS.count("dirs_reused")
+        STATS.count("files_skipped", len(files) - len(stated))
+        STATS.count("files_stat", len(stated))
+        return {"mtime_ns": dir_mtime_ns, "seen_ns": seen_ns, "files": files}, stated
+
+    with os.scandir(transcripts_dir) as it:
+        for entry in it:
+            if not entry.name.endswith(".txt"):
+                continue
+            rec = old_files.get(entry.name)
             try:
-                mtime = datetime.fromtimestamp(txt_file.stat().st_mtime)
-                if not in_work_window(mtime, report_date, start_hour, end_hour):
+                if (rec and rec[2] == entry.inode()
+                        and _outside_windows(rec[0], rec[1], starts_ns, ends_ns)):
+                    files[entry.name] = rec
                     continue
-                content = txt_file.read_text(encoding="utf-8", errors="replace")
-                full_turns = parse_transcript_full(content)
-                user_messages = [c for r, c in full_turns if r == "user"]
-                session_id = txt_file.stem
-                results.append((slug, project_path, mtime, user_messages, full_turns, session_id))
-            except Exception:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
                 continue
+            files[entry.name] = [st.st_mtime_ns, scan_ns, st.st_ino]
+            stated.append((Path(entry.path), st))
+    STATS.count("dirs_listed")
+    STATS.count("files_skipped", len(files) - len(stated))
+    STATS.count("files_stat", len(stated))
+    return {"mtime_ns": dir_mtime_ns, "seen_ns": scan_ns, "files": files}, stated
 
-    return results
+
+def collect_transcripts_by_day(
+    report_dates: list[datetime],
+    start_hour: int = 3,
+    end_hour: int = 1,
+    use_cache: bool = True,
+    jobs: int = 1,
+    streaming: bool = False,
+    projects_root: Path | None = None,
+    workspace_storage: Path | None = None,
+    cache_dir: Path | None = None,
+) -> dict[datetime, list[tuple[str, str, datetime, list[str], list[tuple[str, str]], str]]]:
+    """
+    collect_transcripts for several report dates with a single scan: every transcript is
+    stat'ed at most once and goes to the date whose work window contains its mtime.
+    With use_cache, SCAN_MANIFEST_PATH remembers transcript mtimes so files (and whole
+    directories) that cannot be in any window are not stat'ed again.
+    projects_root and workspace_storage default to CURSOR_PROJECTS and CURSOR_WS_STORAGE; with
+    cache_dir, the workspace index and scan manifest are kept there instead of
+    WORKSPACE_INDEX_PATH and SCAN_MANIFEST_PATH (the parse cache is keyed by transcript path
+    and always shared).
+    """
+    projects_root = projects_root or CURSOR_PROJECTS
+    index_path = cache_dir / WORKSPACE_INDEX_PATH.name if cache_dir else None
+    manifest_path = cache_dir / SCAN_MANIFEST_PATH.name if cache_dir else SCAN_MANIFEST_PATH
+    by_day: dict[datetime, list] = {d: [] for d in report_dates}
+    windows = sorted(work_window(d, start_hour, end_hour) + (d,) for d in report_dates)
+    window_starts = [day_start for day_start, _, _ in windows]
+    with STATS.stage("workspaces"):
+        workspace_paths = get_workspace_paths(use_cache, workspace_storage, index_path)
+
+    if not projects_root.exists():
+        return by_day
+
+    # Window bounds in ns for _outside_windows, widened by 1 ms so it never disagrees with
+    # the datetime comparison below at the edges.
+    starts_ns = [int(day_start.timestamp() * 1e9) - 1_000_000 for day_start, _, _ in windows]
+    ends_ns = [int(day_end.timestamp() * 1e9) + 1_000_000 for _, day_end, _ in windows]
+    scan_ns = time.time_ns()
+    manifest = _read_cache_json(manifest_path) if use_cache else {}
+    new_manifest: dict[str, dict] = {}
+
+    found: list[tuple[datetime, str, str, datetime, Path, os.stat_result]] = []
+    with STATS.stage("scan"):
+        with os.scandir(projects_root) as projects:
+            for project_dir in projects:
+                slug = project_dir.name
+                if slug.startswith("tmp-"):
+                    continue
+                try:
+                    if not project_dir.is_dir():
+                        continue
+                    transcripts_dir = os.path.join(project_dir.path, "agent-transcripts")
+                    entry, stated = _scan_transcripts_dir(
+                        transcripts_dir, manifest.get(transcripts_dir), scan_ns, starts_ns, ends_ns
+                    )
+                except OSError:
+                    continue
+                new_manifest[transcripts_dir] = entry
+                project_path = workspace_paths.get(slug) or slug_to_path(slug)
+
+                for txt_file, st in stated:
+                    mtime = datetime.fromtimestamp(st.st_mtime)
+                    i = bisect_right(window_starts, mtime) - 1
+                    if i < 0 or mtime >= windows[i][1]:
+                        continue
+                    found.append((windows[i][2], slug, project_path, mtime, txt_file, st))
+        if use_cache and new_manifest != manifest:
+            _write_cache_json(manifest_path, new_manifest)
+    STATS.count("files_in_window", len(found))
+
+    with STATS.stage("parse"):
+        all_turns = _load_all_turns(
+            [(txt_file, st) for *_, txt_file, st in found], use_cache, jobs, streaming
+        )
+    for (day, slug, project_path, mtime, txt_file, _), full_turns in zip(found, all_turns):
+        if full_turns is None:
+            continue
+        if isinstance(full_turns, StreamedTurns):
+            user_messages = full_turns.user_messages
+        else:
+            user_messages = [c for r, c in full_turns if r == "user"]
+        session_id = txt_file.stem
+        by_day[day].append((slug, project_path, mtime, user_messages, full_turns, session_id))
+
+    if use_cache:
+        with STATS.stage("cache eviction"):
+            evict_parse_cache()
+    return by_day
 
 
 def _escape_fence(s: str, fence: str = "```") -> str:
@@ -257,80 +971,140 @@ def _escape_fence(s: str, fence: str = "```") -> str:
 _CODE_OMITTED = "[کد/محتوای طولانی حذف شده]"
 
 
-def _remove_fenced_blocks(text: str) -> str:
-    """Replace ```...``` and ````...```` blocks with a short placeholder."""
-    out = text
-    # Match ``` or ````, optional lang, newline, content until closing fence
-    for _ in range(100):  # limit iterations
-        m = re.search(r"(`{3,})\w*\n.*?\n\1", out, re.DOTALL)
-        if not m:
+def _strip_think_blocks(text: str) -> str:
+    """
+    Cut every <think>...</think> block (the text around it is joined with a blank line),
+    in one left-to-right pass.
+    """
+    pieces: list[str] = []
+    pos = 0
+    while True:
+        think_open = _THINK_OPEN_RE.search(text, pos)
+        if not think_open:
             break
-        out = out[: m.start()] + _CODE_OMITTED + out[m.end() :]
-    return out
+        think_close = _THINK_CLOSE_RE.search(text, think_open.end())
+        if not think_close:
+            break
+        pieces.append(text[pos : think_open.start()])
+        # rstrip() everything kept so far (earlier separators included)
+        while pieces and not pieces[-1].strip():
+            pieces.pop()
+        if pieces:
+            pieces[-1] = pieces[-1].rstrip()
+        pieces.append("\n\n")
+        pos = think_close.end()
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+    pieces.append(text[pos:])
+    return "".join(pieces)
 
 
-def _shorten_tool_call_body(text: str) -> str:
+def _backtick_prefix(line: str) -> int:
+    """Number of backticks at the start of line."""
+    return len(line) - len(line.lstrip("`"))
+
+
+def _fence_opening(line: str) -> tuple[int, int]:
     """
-    Replace long 'contents:', 'old_string:', 'new_string:' values in [Tool call] blocks
-    so the report stays short; keep path and tool name for context.
+    Opening fence candidate in line: a run of backticks followed only by a language tag
+    (word chars) up to the end of the line. Returns (run_start, run_end), or (-1, -1).
     """
-    lines = text.split("\n")
-    result: list[str] = []
-    i = 0
+    end = len(line)
+    while end > 0 and (line[end - 1].isalnum() or line[end - 1] == "_"):
+        end -= 1
+    run_start = end
+    while run_start > 0 and line[run_start - 1] == "`":
+        run_start -= 1
+    if end - run_start < 3:
+        return -1, -1
+    return run_start, end
 
-    def is_key_line(ln: str) -> bool:
-        s = ln.strip()
-        return (s.startswith("path:") or s.startswith("contents:") or
-                s.startswith("old_string:") or s.startswith("new_string:"))
 
+def _collapse_fenced_lines(lines: list[str]) -> Iterator[str]:
+    r"""
+    Lines with every ```...``` / ````...```` block replaced by _CODE_OMITTED; same result as
+    re.sub(r"(`{3,})\w*\n.*?\n\1", _CODE_OMITTED, text, flags=re.DOTALL), in one pass.
+    A block opened on line i closes on the first line j >= i + 2 that starts with at least
+    as many backticks; text before the opening and after the closing fence is kept.
+    """
+    # most_ticks[j]: longest backtick prefix on lines j.. (can a fence still close there?)
+    most_ticks = [0] * (len(lines) + 1)
+    for j in range(len(lines) - 1, -1, -1):
+        most_ticks[j] = max(most_ticks[j + 1], _backtick_prefix(lines[j]))
+    i = 0
     while i < len(lines):
         line = lines[i]
-        # Skip long content after "contents:"
-        if is_key_line(line) and "contents:" in line:
-            result.append(line.split("contents:")[0].rstrip() + " contents: " + _CODE_OMITTED)
-            i += 1
-            while i < len(lines):
-                if lines[i].startswith("[Tool") or is_key_line(lines[i]):
-                    break
-                i += 1
-            continue
-        # Skip long content after "old_string:"
-        if is_key_line(line) and "old_string:" in line:
-            result.append(line.split("old_string:")[0].rstrip() + " old_string: " + _CODE_OMITTED)
-            i += 1
-            while i < len(lines):
-                if lines[i].strip().startswith("new_string:") or lines[i].startswith("[Tool"):
-                    break
-                i += 1
-            continue
-        # Skip long content after "new_string:"
-        if is_key_line(line) and "new_string:" in line:
-            result.append(line.split("new_string:")[0].rstrip() + " new_string: " + _CODE_OMITTED)
-            i += 1
-            while i < len(lines):
-                if lines[i].startswith("[Tool") or (is_key_line(lines[i]) and "old_string:" in lines[i]):
-                    break
-                i += 1
-            continue
-        result.append(line)
+        out = ""
+        while i + 2 < len(lines):
+            run_start, run_end = _fence_opening(line)
+            # The leftmost start in the run whose fence can still be closed wins.
+            width = min(run_end - run_start, most_ticks[i + 2])
+            if run_start == -1 or width < 3:
+                break
+            j = i + 2
+            while _backtick_prefix(lines[j]) < width:
+                j += 1
+            out += line[: run_end - width] + _CODE_OMITTED
+            # Keep scanning the rest of the closing line for another opening fence.
+            i, line = j, lines[j][width:]
+        yield out + line
         i += 1
-    return "\n".join(result)
+
+
+def _remove_fenced_blocks(text: str) -> str:
+    """Replace ```...``` and ````...```` blocks with a short placeholder."""
+    return "\n".join(_collapse_fenced_lines(text.split("\n")))
+
+
+def _is_tool_key_line(line: str) -> bool:
+    s = line.strip()
+    return (s.startswith("path:") or s.startswith("contents:") or
+            s.startswith("old_string:") or s.startswith("new_string:"))
+
+
+def _shorten_tool_call_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Replace long 'contents:', 'old_string:', 'new_string:' values in [Tool call] blocks
+    so the report stays short; keep path and tool name for context.
+    One pass: after a shortened key, lines are dropped until the line that ends its value.
+    """
+    skipping = None
+    for line in lines:
+        if skipping == "contents:":
+            if not (line.startswith("[Tool") or _is_tool_key_line(line)):
+                continue
+        elif skipping == "old_string:":
+            if not (line.strip().startswith("new_string:") or line.startswith("[Tool")):
+                continue
+        elif skipping == "new_string:":
+            if not (line.startswith("[Tool") or (_is_tool_key_line(line) and "old_string:" in line)):
+                continue
+        skipping = None
+        if _is_tool_key_line(line):
+            for key in ("contents:", "old_string:", "new_string:"):
+                if key in line:
+                    yield line.split(key)[0].rstrip() + " " + key + " " + _CODE_OMITTED
+                    skipping = key
+                    break
+            if skipping:
+                continue
+        yield line
+
+
+def _shorten_tool_call_body(text: str) -> str:
+    """Shorten tool call bodies in text (see _shorten_tool_call_lines)."""
+    return "\n".join(_shorten_tool_call_lines(text.split("\n")))
 
 
 def _clean_assistant_content(raw: str) -> str:
     """
     Strip <think>, remove/shorten code blocks and long tool call bodies,
     so the report stays light for AI and focuses on what was done.
+    Linear time: think blocks are cut in one pass, then fences and tool call bodies are
+    handled in a single scan over the lines.
     """
-    out = raw
-    while True:
-        m = re.search(r"<think>\s*.*?\s*</think>", out, re.DOTALL | re.IGNORECASE)
-        if not m:
-            break
-        out = out[: m.start()].rstrip() + "\n\n" + out[m.end() :].lstrip()
-    out = _remove_fenced_blocks(out)
-    out = _shorten_tool_call_body(out)
-    return re.sub(r"\n{3,}", "\n\n", out).strip()
+    lines = _shorten_tool_call_lines(_collapse_fenced_lines(_strip_think_blocks(raw).split("\n")))
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
 
 
 def build_report(
@@ -339,13 +1113,213 @@ def build_report(
     end_hour: int = 1,
     max_first_message_chars: int = 500,
     compact: bool = True,
+    use_cache: bool = True,
+    jobs: int = 1,
+    streaming: bool = False,
+    rows: list[tuple[str, str, datetime, list[str], list[tuple[str, str]], str]] | None = None,
+    dedupe: bool = False,
+    delta: bool = False,
 ) -> str:
     """
     Build markdown report for daily work.
     If compact=True (default): only project, time, and work summary (user requests).
     No full chat text — keeps report small for AI and human review.
+    With streaming=True, large transcripts are read lazily while rendering (see collect_transcripts).
+    rows: already collected transcripts for report_date (e.g. from collect_transcripts_by_day).
+    With dedupe=True, requests repeated (or nearly repeated) across a project's chats are listed
+    once, with a count (see message_dedupe).
+    With delta=True, sessions continued from an earlier day's report only show their new turns
+    (see delta_rows).
+    The text comes from iter_report; write_report writes it out without building the string.
+    """
+    return "".join(
+        iter_report(
+            report_date, start_hour, end_hour, max_first_message_chars, compact, use_cache, jobs,
+            streaming, rows, dedupe, delta,
+        )
+    )
+
+
+def iter_report(
+    report_date: datetime,
+    start_hour: int = 3,
+    end_hour: int = 1,
+    max_first_message_chars: int = 500,
+    compact: bool = True,
+    use_cache: bool = True,
+    jobs: int = 1,
+    streaming: bool = False,
+    rows: list[tuple[str, str, datetime, list[str], list[tuple[str, str]], str]] | None = None,
+    dedupe: bool = False,
+    delta: bool = False,
+) -> Iterator[str]:
+    """
+    build_report's text in pieces: the header, each project heading and each chat. Only one
+    piece is held at a time, so a --full report does not have to fit in memory twice.
+    """
+    if rows is None:
+        rows = collect_transcripts(
+            report_date, start_hour, end_hour, use_cache=use_cache, jobs=jobs, streaming=streaming
+        )
+    continued: dict[str, int] = {}
+    if delta:
+        with STATS.stage("delta"):
+            snapshots = _read_cache_json(SNAPSHOT_PATH)
+            saved = dict(snapshots)
+            rows, continued = delta_rows(rows, report_date, snapshots)
+            prune_snapshots(snapshots)
+            if snapshots != saved:
+                _write_cache_json(SNAPSHOT_PATH, snapshots)
+    # Only producing each piece counts as "render", not writing it out.
+    yield from STATS.iter_stage("render", _render_report(
+        report_date, start_hour, end_hour, max_first_message_chars, compact, rows, dedupe,
+        continued,
+    ))
+
+
+def write_report(out: TextIO, report_date: datetime, **options) -> None:
+    """Write iter_report(report_date, **options) to out as each piece is rendered."""
+    for piece in iter_report(report_date, **options):
+        out.write(piece)
+
+
+def write_report_file(path: Path, report_date: datetime, **options) -> None:
+    """write_report to path; the file is replaced only once the whole report is written."""
+    tmp_path = path.with_name(path.name + ".part")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            write_report(out, report_date, **options)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _turn_digest(digest, role: str, text: str) -> None:
+    digest.update(role.encode("utf-8") + b"\0" + text.encode("utf-8", errors="replace") + b"\0")
+
+
+def delta_rows(
+    rows: list[tuple[str, str, datetime, list[str], list[tuple[str, str]], str]],
+    report_date: datetime,
+    snapshots: dict,
+) -> tuple[list[tuple[str, str, datetime, list[str], list[tuple[str, str]], str]], dict[str, int]]:
+    """
+    Rows with only the turns added since the latest report date before report_date in
+    snapshots, and {session_id: turns left out}. A session with no new turns is dropped; one
+    whose earlier turns changed is kept whole. Each session's turn count and content hash are
+    recorded in snapshots under report_date, so building the same day again gives the same
+    result and later days start from it.
+    """
+    day = report_date.strftime("%Y-%m-%d")
+    out = []
+    continued: dict[str, int] = {}
+    for slug, path, mtime, _, full_turns, session_id in rows:
+        history = [e for e in snapshots.get(session_id, []) if e[0] != day]
+        earlier = [e for e in history if e[0] < day]
+        seen, seen_hash = (earlier[-1][1], earlier[-1][2]) if earlier else (0, None)
+        digest = hashlib.sha1()
+        n = 0
+        new_turns: list[tuple[str, str]] = []
+        prefix_hash = digest.hexdigest() if seen == 0 else None
+        for role, text in full_turns:
+            if n < seen:
+                _turn_digest(digest, role, text)
+            n += 1
+            if n == seen:
+                prefix_hash = digest.hexdigest()
+            if n > seen:
+                new_turns.append((role, text))
+                _turn_digest(digest, role, text)
+        snapshots[session_id] = sorted(history + [[day, n, digest.hexdigest()]])
+        if seen and prefix_hash != seen_hash:
+            new_turns = list(full_turns)  # rewritten or shorter: report the whole session
+        elif seen:
+            if not new_turns:
+                STATS.count("delta_sessions_unchanged")
+                continue
+            continued[session_id] = seen
+            STATS.count("delta_turns_skipped", seen)
+        user_messages = [text for role, text in new_turns if role == "user"]
+        out.append((slug, path, mtime, user_messages, new_turns, session_id))
+    return out, continued
+
+
+def prune_snapshots(snapshots: dict, max_age_days: int = SNAPSHOT_MAX_AGE_DAYS) -> int:
+    """
+    Drop delta_rows entries of report dates more than max_age_days ago, keeping each session's
+    latest older entry so reports within the period still find their starting point. Sessions
+    with no entry in the period are dropped entirely. Returns the number of entries removed.
+    """
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime("%Y-%m-%d")
+    removed = 0
+    for session_id, history in list(snapshots.items()):
+        if not isinstance(history, list) or not history or history[-1][0] < cutoff:
+            removed += len(history) if isinstance(history, list) else 1
+            del snapshots[session_id]
+            continue
+        old = sum(1 for entry in history if entry[0] < cutoff)
+        if old > 1:
+            snapshots[session_id] = history[old - 1:]
+            removed += old - 1
+    return removed
+
+
+def _render_report(
+    report_date: datetime,
+    start_hour: int,
+    end_hour: int,
+    max_first_message_chars: int,
+    compact: bool,
+    rows: list[tuple[str, str, datetime, list[str], list[tuple[str, str]], str]],
+    dedupe: bool = False,
+    continued: dict[str, int] | None = None,
+) -> Iterator[str]:
+    """
+    Markdown for iter_report from collected rows, in pieces; continued maps session_id to the
+    number of earlier turns left out (delta_rows).
+    """
+    projects, collapsed, collapsed_chars = _plan_projects(rows, max_first_message_chars, dedupe)
+    day_str = report_date.strftime("%Y-%m-%d")
+    window_str = f"{start_hour}:00 – next day {end_hour}:00"
+    header = [
+        f"# Cursor Daily Work Report — {day_str}",
+        "",
+        f"Time window: **{window_str}** (based on file last-modified time).",
+        "",
+    ]
+    if collapsed:
+        header += [
+            f"Repeated requests collapsed: **{collapsed}** ({collapsed_chars} characters, "
+            f"~{collapsed_chars // CHARS_PER_TOKEN} tokens saved).",
+            "",
+        ]
+        STATS.count("dedupe_collapsed", collapsed)
+        STATS.count("dedupe_chars_saved", collapsed_chars)
+    header += ["---", ""]
+    if not rows:
+        header += [
+            "*No Cursor agent transcripts found in the selected time window.*",
+            "",
+            "Make sure you use Cursor in Agent/Composer mode so that transcripts are saved under `~/.cursor/projects/<project>/agent-transcripts/`.",
+            "",
+        ]
+    # The pieces join to "\n".join() of all lines: no newline after the last one.
+    yield "\n".join(header)
+    for chunk in _project_chunks(projects, compact, continued):
+        yield "\n" + "\n".join(chunk)
+
+
+def _plan_projects(
+    rows: list[tuple[str, str, datetime, list[str], list[tuple[str, str]], str]],
+    max_first_message_chars: int,
+    dedupe: bool = False,
+) -> tuple[list[tuple[str, str, list, list[list[str]], dict[tuple[int, int], int]]], int, int]:
+    """
+    Rows grouped by project in report order, as (display name, path, chats by time, request
+    previews per chat, repeats), plus the number of requests collapsed by dedupe and their
+    characters. repeats maps (chat, request) to how often it was asked in the project, 0 for
+    a repeat of an earlier one; it is empty without dedupe.
     """
-    rows = collect_transcripts(report_date, start_hour, end_hour)
     by_project: dict[tuple[str, str], list[tuple[datetime, list[str], list[tuple[str, str]], str]]] = {}
     for slug, path, mtime, messages, full_turns, session_id in rows:
         display = path_to_display_name(slug)
@@ -354,36 +1328,71 @@ def build_report(
             by_project[key] = []
         by_project[key].append((mtime, messages, full_turns, session_id))
 
-    lines = []
-    day_str = report_date.strftime("%Y-%m-%d")
-    window_str = f"{start_hour}:00 – next day {end_hour}:00"
-    lines.append(f"# Cursor Daily Work Report — {day_str}")
-    lines.append("")
-    lines.append(f"Time window: **{window_str}** (based on file last-modified time).")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-
+    projects = []
+    collapsed = 0
+    collapsed_chars = 0
     for (display_name, path) in sorted(by_project.keys(), key=lambda x: x[0].lower()):
         items = by_project[(display_name, path)]
         items.sort(key=lambda x: x[0])
-        lines.append(f"## {display_name}")
-        lines.append("")
-        lines.append(f"**Path:** `{path}`")
-        lines.append("")
+        previews = [
+            [_message_preview(msg, max_first_message_chars) for msg in item[1]] for item in items
+        ]
+        repeats: dict[tuple[int, int], int] = {}
+        if dedupe:
+            with STATS.stage("render: dedupe"):
+                refs = [(i, j) for i, chat in enumerate(previews) for j in range(len(chat))]
+                groups = group_duplicates([previews[i][j] for i, j in refs])
+            for ref, first in zip(refs, groups):
+                if refs[first] == ref:
+                    repeats[ref] = 1
+                else:
+                    repeats[ref] = 0
+                    repeats[refs[first]] += 1
+                    collapsed += 1
+                    collapsed_chars += len(previews[ref[0]][ref[1]])
+        projects.append((display_name, path, items, previews, repeats))
+    return projects, collapsed, collapsed_chars
+
 
+def _project_chunks(
+    projects: list[tuple[str, str, list, list[list[str]], dict[tuple[int, int], int]]],
+    compact: bool,
+    continued: dict[str, int] | None = None,
+    level: int = 2,
+) -> Iterator[list[str]]:
+    """
+    Lines of the _plan_projects sections, a project heading (at `level`) or one chat (a level
+    below) at a time, so a full chat text is only held while it is written.
+    """
+    heading = "#" * level
+    for display_name, path, items, previews, repeats in projects:
+        yield [f"{heading} {display_name}", "", f"**Path:** `{path}`", ""]
         for i, (mtime, all_msgs, full_turns, session_id) in enumerate(items, 1):
-            lines.append(f"### Chat {i} — {mtime.strftime('%Y-%m-%d %H:%M')}")
+            lines = []
+            lines.append(f"{heading}# Chat {i} — {mtime.strftime('%Y-%m-%d %H:%M')}")
             lines.append("")
+            if continued and session_id in continued:
+                lines.append(
+                    f"_Continued chat: {continued[session_id]} earlier turns were in an "
+                    "earlier report._"
+                )
+                lines.append("")
             lines.append(f"**کارهای درخواست‌شده ({len(all_msgs)} مورد):**")
             lines.append("")
-            for j, msg in enumerate(all_msgs, 1):
-                preview = msg.strip()
-                if len(preview) > max_first_message_chars:
-                    preview = preview[:max_first_message_chars] + "…"
+            j = 0
+            for k, preview in enumerate(previews[i - 1]):
+                count = repeats.get((i - 1, k), 1)
+                if count == 0:
+                    continue
+                j += 1
+                if count > 1:
+                    preview += f" (×{count})"
                 lines.append(f"{j}. {preview}")
                 if "\n" in preview:
                     lines.append("")
+            if j < len(all_msgs):
+                lines.append(f"_+{len(all_msgs) - j} repeated (counted above)_")
+                lines.append("")
             if not compact:
                 lines.append("")
                 lines.append("**Specs:**")
@@ -397,7 +1406,11 @@ def build_report(
                     label = "**User**" if role == "user" else "**Assistant**"
                     lines.append(label)
                     lines.append("")
-                    clean = _clean_assistant_content(content) if role == "assistant" else content
+                    if role == "assistant":
+                        with STATS.stage("render: clean"):
+                            clean = _clean_assistant_content(content)
+                    else:
+                        clean = content
                     fence = _escape_fence(clean)
                     lines.append(fence)
                     lines.append(clean.strip())
@@ -405,16 +1418,100 @@ def build_report(
                     lines.append("")
             lines.append("---")
             lines.append("")
+            yield lines
+        yield [""]
 
-        lines.append("")
 
-    if not by_project:
-        lines.append("*No Cursor agent transcripts found in the selected time window.*")
-        lines.append("")
-        lines.append("Make sure you use Cursor in Agent/Composer mode so that transcripts are saved under `~/.cursor/projects/<project>/agent-transcripts/`.")
-        lines.append("")
+def _message_preview(msg: str, max_chars: int) -> str:
+    preview = msg.strip()
+    if len(preview) > max_chars:
+        preview = preview[:max_chars] + "…"
+    return preview
 
-    return "\n".join(lines)
+
+def write_sessions_jsonl(
+    out_path: Path,
+    rows: list[tuple[str, str, datetime, list[str], list[tuple[str, str]], str]],
+    report_date: datetime,
+    start_hour: int,
+    end_hour: int,
+) -> int:
+    """
+    Write collected rows to out_path as JSON lines, one session per line, as they are
+    serialized: report date and window, slug, project path, transcript path, session_id, mtime,
+    turns ({"role", "text", "start", "end"}) and counts. The transcript path and start/end (the
+    turn's character offsets, see iter_transcript_spans) are the ones recorded when the rows
+    were collected (TranscriptTurns), or null for rows that do not carry them. Only streamed
+    transcripts are read again, for their text. Returns the number of sessions written.
+    """
+    tmp_path = out_path.with_name(out_path.name + ".part")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with tmp_path.open("w", encoding="utf-8") as f:
+        for slug, path, mtime, _, full_turns, session_id in rows:
+            txt_file = getattr(full_turns, "txt_file", None)
+            offsets = getattr(full_turns, "offsets", None)
+            if isinstance(full_turns, StreamedTurns):
+                turns = list(iter_transcript_spans(txt_file))
+            elif offsets is not None and len(offsets) == len(full_turns):
+                turns = [(role, text, a, b) for (role, text), (a, b) in zip(full_turns, offsets)]
+            else:
+                turns = [(role, text, None, None) for role, text in full_turns]
+            record = {
+                "report_date": report_date.strftime("%Y-%m-%d"),
+                "start_hour": start_hour,
+                "end_hour": end_hour,
+                "slug": slug,
+                "path": path,
+                "transcript": str(txt_file) if txt_file else None,
+                "session_id": session_id,
+                "mtime": mtime.isoformat(),
+                "turns": [
+                    {"role": role, "text": text, "start": start, "end": end}
+                    for role, text, start, end in turns
+                ],
+                "counts": {
+                    "turns": len(turns),
+                    "user": sum(1 for t in turns if t[0] == "user"),
+                    "assistant": sum(1 for t in turns if t[0] == "assistant"),
+                    "chars": sum(len(t[1]) for t in turns),
+                },
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, out_path)
+    return len(rows)
+
+
+def read_sessions_jsonl(
+    path: Path,
+) -> tuple[dict, list[tuple[str, str, datetime, list[str], list[tuple[str, str]], str]]]:
+    """
+    Rows (as from collect_transcripts) from a write_sessions_jsonl file, read line by line,
+    and the report date and window of its first record ({} for an empty export).
+    """
+    meta: dict = {}
+    rows = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not meta:
+                meta = {k: record[k] for k in ("report_date", "start_hour", "end_hour")}
+            offsets = [(t["start"], t["end"]) for t in record["turns"]]
+            full_turns = TranscriptTurns(
+                [(t["role"], t["text"]) for t in record["turns"]],
+                Path(record["transcript"]) if record.get("transcript") else None,
+                None if any(a is None for a, _ in offsets) else offsets,
+            )
+            rows.append((
+                record["slug"],
+                record["path"],
+                datetime.fromisoformat(record["mtime"]),
+                [text for role, text in full_turns if role == "user"],
+                full_turns,
+                record["session_id"],
+            ))
+    return meta, rows
 
 
 def main() -> None:
@@ -456,8 +1553,168 @@ def main() -> None:
         action="store_true",
         help="Include full chat text (default: compact, only work summary).",
     )
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every transcript instead of using the parsed-transcript cache (.cache/).",
+    )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parse transcripts in N worker processes (0 = one per CPU). Default 1.",
+    )
+    ap.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read large transcripts (1 MB+) in chunks and keep their turns out of memory.",
+    )
+    ap.add_argument(
+        "--from",
+        dest="date_from",
+        type=str,
+        default=None,
+        help="First date YYYY-MM-DD of a range; with --to, writes one report per day in one scan.",
+    )
+    ap.add_argument(
+        "--to",
+        dest="date_to",
+        type=str,
+        default=None,
+        help="Last date YYYY-MM-DD of a range (inclusive).",
+    )
+    ap.add_argument(
+        "--output-dir",
+        type=str,
+        default=None,
+        help="Directory for range and --watch reports cursor-report-YYYY-MM-DD.md (default: reports/ next to this script).",
+    )
+    ap.add_argument(
+        "--jsonl",
+        type=str,
+        default=None,
+        help="Also export the sessions as JSON lines to this file (with --from/--to: to this "
+        "folder, as cursor-sessions-YYYY-MM-DD.jsonl).",
+    )
+    ap.add_argument(
+        "--input",
+        type=str,
+        default=None,
+        help="Build the report from a --jsonl export instead of reading transcripts.",
+    )
+    ap.add_argument(
+        "--delta",
+        action="store_true",
+        help="For chats already in an earlier day's report, include only the turns added since "
+        f"(state kept in {SNAPSHOT_PATH.name}).",
+    )
+    ap.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="List requests repeated (or nearly repeated) across a project's chats once, "
+        "with a count.",
+    )
+    ap.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and rewrite today's report in --output-dir whenever a transcript "
+        "changes (SIGUSR1 rewrites it at once).",
+    )
+    ap.add_argument(
+        "--summarize-every",
+        type=float,
+        default=0,
+        metavar="MINUTES",
+        help="With --watch, also refresh the Gemini summary at most every MINUTES and when "
+        "the work day ends (default 0: no summary).",
+    )
+    ap.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch, look for changes by listing the transcript folders instead of "
+        "inotify (e.g. on network file systems).",
+    )
+    add_stats_argument(ap)
     args = ap.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
+    STATS.enabled = args.stats is not None
+
+    if args.watch:
+        if args.date or args.date_from or args.date_to or args.input or args.output or args.jsonl:
+            print("--watch follows the current day; it does not work with --date, --from/--to, "
+                  "--input, --output or --jsonl.")
+            return
+        from transcript_watch import watch
+
+        out_dir = Path(args.output_dir) if args.output_dir else Path(__file__).resolve().parent / "reports"
+        watch(
+            out_dir,
+            start_hour=args.start,
+            end_hour=args.end,
+            use_cache=not args.no_cache,
+            jobs=jobs,
+            summarize_every=args.summarize_every,
+            poll=args.poll,
+            max_first_message_chars=args.max_chars,
+            compact=not args.full,
+            dedupe=args.dedupe,
+            delta=args.delta,
+        )
+        write_stats(args.stats)
+        return
+
+    if args.date_from or args.date_to:
+        if args.input:
+            print("--input builds a single report; it does not work with --from/--to.")
+            return
+        try:
+            date_from = datetime.strptime(args.date_from or "", "%Y-%m-%d")
+            date_to = datetime.strptime(args.date_to or "", "%Y-%m-%d")
+        except ValueError:
+            print("Invalid --from/--to; use both, as YYYY-MM-DD.")
+            return
+        if date_to < date_from:
+            print("--to must not be before --from.")
+            return
+        dates = [date_from + timedelta(days=i) for i in range((date_to - date_from).days + 1)]
+        out_dir = Path(args.output_dir) if args.output_dir else Path(__file__).resolve().parent / "reports"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        rows_by_day = collect_transcripts_by_day(
+            dates, args.start, args.end, use_cache=not args.no_cache, jobs=jobs, streaming=args.stream
+        )
+        for day in dates:
+            out_path = out_dir / f"cursor-report-{day.strftime('%Y-%m-%d')}.md"
+            write_report_file(
+                out_path,
+                day,
+                start_hour=args.start,
+                end_hour=args.end,
+                max_first_message_chars=args.max_chars,
+                compact=not args.full,
+                rows=rows_by_day[day],
+                dedupe=args.dedupe,
+                delta=args.delta,
+            )
+            with STATS.stage("write"):
+                if args.jsonl:
+                    write_sessions_jsonl(
+                        Path(args.jsonl) / f"cursor-sessions-{day.strftime('%Y-%m-%d')}.jsonl",
+                        rows_by_day[day], day, args.start, args.end,
+                    )
+            print(f"Report written to: {out_path}")
+        write_stats(args.stats)
+        return
 
+    rows = None
+    if args.input:
+        try:
+            meta, rows = read_sessions_jsonl(Path(args.input))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not read {args.input}: {e}")
+            return
+        args.date = args.date or meta.get("report_date")
+        args.start = meta.get("start_hour", args.start)
+        args.end = meta.get("end_hour", args.end)
     if args.date:
         try:
             report_date = datetime.strptime(args.date, "%Y-%m-%d")
@@ -467,19 +1724,38 @@ def main() -> None:
     else:
         report_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
 
-    report = build_report(
-        report_date,
+    if rows is None and args.jsonl:
+        rows = collect_transcripts(
+            report_date, args.start, args.end,
+            use_cache=not args.no_cache, jobs=jobs, streaming=args.stream,
+        )
+    options = dict(
         start_hour=args.start,
         end_hour=args.end,
         max_first_message_chars=args.max_chars,
         compact=not args.full,
+        use_cache=not args.no_cache,
+        jobs=jobs,
+        streaming=args.stream,
+        rows=rows,
+        dedupe=args.dedupe,
+        delta=args.delta,
     )
-
+    # The report is written while it is rendered, never held as one string.
     if args.output:
-        Path(args.output).write_text(report, encoding="utf-8")
-        print(f"Report written to: {args.output}")
+        write_report_file(Path(args.output), report_date, **options)
     else:
-        print(report)
+        write_report(sys.stdout, report_date, **options)
+        print()
+    if args.jsonl and not args.input:
+        with STATS.stage("write"):
+            count = write_sessions_jsonl(
+                Path(args.jsonl), rows, report_date, args.start, args.end
+            )
+        print(f"{count} sessions exported to: {args.jsonl}", file=sys.stderr)
+    if args.output:
+        print(f"Report written to: {args.output}")
+    write_stats(args.stats)
 
 
 if __name__ == "__main__":
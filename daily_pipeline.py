@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Raw report and Gemini summary for one day in a single process (what run_daily_report.sh runs).
+
+The report is built in memory and handed straight to the summary step, so nothing is read
+back from disk and the date does not have to be recovered from a file name. The raw report
+is still saved to reports/cursor-report-YYYY-MM-DD.md, by a background thread while Gemini
+works. The summary modules are imported only once the report is ready.
+
+Usage:
+  python3 daily_pipeline.py                 # today
+  python3 daily_pipeline.py 2026-01-30      # that date
+  python3 daily_pipeline.py --stream --stats
+  python3 daily_pipeline.py --delta         # leave out turns already in an earlier report
+  python3 daily_pipeline.py --dedupe        # list repeated requests once
+"""
+
+import argparse
+import os
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from report_stats import STATS, add_stats_argument, write_stats
+
+
+def _write_report(path: Path, report: str, errors: list[OSError]) -> None:
+    """Write report to path atomically; a failure is appended to errors."""
+    tmp_path = path.with_name(path.name + ".part")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(report, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        errors.append(e)
+
+
+def main() -> None:
+    script_dir = Path(__file__).resolve().parent
+    ap = argparse.ArgumentParser(
+        description="Build the Cursor daily report and its Gemini summary in one run."
+    )
+    ap.add_argument(
+        "date", nargs="?", default=None, help="Report date YYYY-MM-DD (default: today)."
+    )
+    ap.add_argument(
+        "--reports-dir",
+        default=str(script_dir / "reports"),
+        help="Folder for cursor-report-*.md and summary-report-*.md (default: reports/).",
+    )
+    ap.add_argument("--api-key", default=None, help="Gemini API key (default: GEMINI_API_KEY).")
+    ap.add_argument(
+        "--model", default=None, help="Gemini model (default: GEMINI_MODEL or built-in)."
+    )
+    ap.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the summary while Gemini writes it.",
+    )
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the parsed-transcript and Gemini response caches.",
+    )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parse transcripts in N worker processes (0 = one per CPU). Default 1.",
+    )
+    ap.add_argument(
+        "--delta",
+        action="store_true",
+        help="Only turns not already in an earlier day's report (smaller prompt).",
+    )
+    ap.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="List requests repeated across a project's chats once, with a count.",
+    )
+    ap.add_argument(
+        "--max-prompt-tokens",
+        type=int,
+        default=None,
+        help="Cut the report down to about this many prompt tokens (default: "
+        "GEMINI_MAX_PROMPT_TOKENS or summary_report.py's limit; 0 = no limit).",
+    )
+    add_stats_argument(ap)
+    args = ap.parse_args()
+    STATS.enabled = args.stats is not None
+
+    if args.date:
+        try:
+            report_date = datetime.strptime(args.date, "%Y-%m-%d")
+        except ValueError:
+            print("Invalid date; use YYYY-MM-DD.", file=sys.stderr)
+            sys.exit(1)
+    else:
+        report_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    day_str = report_date.strftime("%Y-%m-%d")
+    reports_dir = Path(args.reports_dir)
+    raw_path = reports_dir / f"cursor-report-{day_str}.md"
+    summary_path = reports_dir / f"summary-report-{day_str}.md"
+
+    import cursor_daily_report
+
+    report = cursor_daily_report.build_report(
+        report_date,
+        use_cache=not args.no_cache,
+        jobs=args.jobs or os.cpu_count() or 1,
+        dedupe=args.dedupe,
+        delta=args.delta,
+    )
+    write_errors: list[OSError] = []
+    writer = threading.Thread(target=_write_report, args=(raw_path, report, write_errors))
+    writer.start()
+
+    import summary_report
+
+    summary_report.load_dotenv(script_dir / ".env")
+    api_key = args.api_key or os.environ.get("GEMINI_API_KEY")
+    max_prompt_tokens = args.max_prompt_tokens
+    if max_prompt_tokens is None:
+        max_prompt_tokens = int(
+            os.environ.get("GEMINI_MAX_PROMPT_TOKENS") or summary_report.PROMPT_MAX_TOKENS
+        )
+    failed = None
+    if not api_key:
+        failed = "Set GEMINI_API_KEY in .env or pass --api-key=..."
+    else:
+        print("Sending to Gemini...")
+        try:
+            summary_report.summarize_report(
+                report, day_str, summary_path, api_key, model=args.model,
+                use_cache=not args.no_cache, stream=args.stream,
+                max_prompt_tokens=max_prompt_tokens,
+            )
+        except SystemExit as e:
+            failed = str(e.code)
+        if not args.no_cache:
+            summary_report.evict_gemini_cache()
+
+    writer.join()
+    if write_errors:
+        print(f"Could not write {raw_path}: {write_errors[0]}", file=sys.stderr)
+    else:
+        print(f"Open (raw): {raw_path}")
+    if failed is None:
+        print(f"Open (short): {summary_path}")
+    write_stats(args.stats)
+    if failed is not None or write_errors:
+        if failed:
+            print(failed, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
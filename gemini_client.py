@@ -0,0 +1,275 @@
+"""
+Gemini REST client shared by summary_report.py and gemini_summary_report.py (standard library only).
+
+Connections are kept open between requests (one per thread, so a thread pool reuses them),
+request bodies are gzip-compressed and gzip responses are accepted. GeminiClient.agenerate
+runs a request from asyncio code without blocking the event loop, and
+GeminiClient.stream_generate yields the answer piece by piece as the server sends it.
+"""
+
+import gzip
+import http.client
+import json
+import socket
+import threading
+from typing import Iterator
+from urllib.parse import urlsplit
+
+from report_stats import STATS
+
+GEMINI_BASE = "https://generativelanguage.googleapis.com/v1beta/models"
+REQUEST_TIMEOUT = 120
+# Request bodies smaller than this are sent as is.
+GZIP_MIN_BYTES = 1024
+# Google APIs only gzip responses for clients whose User-Agent mentions gzip.
+USER_AGENT = "cursor-daily-report (gzip)"
+
+
+class GeminiHTTPError(Exception):
+    """Non-200 answer from the API."""
+
+    def __init__(self, code: int, body: str, headers: dict[str, str]):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+        self.body = body
+        self.headers = headers
+
+
+class GeminiConnectionError(Exception):
+    """Network failure; `timeout` is True when the request timed out."""
+
+    def __init__(self, reason: str, timeout: bool = False):
+        super().__init__(reason)
+        self.reason = reason
+        self.timeout = timeout
+
+
+def extract_text(data: dict) -> str:
+    """Text of the first candidate; ValueError if the response has none."""
+    try:
+        text = data["candidates"][0]["content"]["parts"][0]["text"]
+    except (KeyError, IndexError, TypeError) as e:
+        raw = json.dumps(data, ensure_ascii=False)[:400]
+        raise ValueError("Invalid Gemini response: " + raw) from e
+    if not (text and str(text).strip()):
+        raise ValueError("Gemini returned empty text.")
+    return str(text).strip()
+
+
+class GeminiClient:
+    def __init__(
+        self,
+        base: str = GEMINI_BASE,
+        timeout: float = REQUEST_TIMEOUT,
+        gzip_requests: bool = True,
+    ):
+        parts = urlsplit(base)
+        self.scheme = parts.scheme
+        self.host = parts.netloc
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.gzip_requests = gzip_requests
+        self._local = threading.local()
+
+    def _connection(self) -> tuple[http.client.HTTPConnection, bool]:
+        """This thread's connection, and whether it was used before."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn, True
+        if self.scheme == "https":
+            conn = http.client.HTTPSConnection(self.host, timeout=self.timeout)
+        else:
+            conn = http.client.HTTPConnection(self.host, timeout=self.timeout)
+        self._local.conn = conn
+        STATS.count("http_connections")
+        return conn, False
+
+    def close(self) -> None:
+        """Close this thread's connection (others are closed when their thread ends)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _headers(self, compressed: bool, accept_gzip: bool = True) -> dict[str, str]:
+        headers = {
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip" if accept_gzip else "identity",
+            "User-Agent": USER_AGENT,
+        }
+        if compressed:
+            headers["Content-Encoding"] = "gzip"
+        return headers
+
+    def _connection_error(self, e: Exception) -> GeminiConnectionError:
+        self.close()
+        if isinstance(e, (socket.timeout, TimeoutError)):
+            return GeminiConnectionError("timed out", timeout=True)
+        return GeminiConnectionError(str(e) or type(e).__name__)
+
+    def _open(
+        self, path: str, payload: bytes, headers: dict[str, str]
+    ) -> http.client.HTTPResponse:
+        """Send the request and return the response with its body still unread."""
+        for attempt in range(2):
+            conn, reused = self._connection()
+            try:
+                conn.request("POST", path, body=payload, headers=headers)
+                resp = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                self.close()
+                if reused and attempt == 0:
+                    continue  # the server closed an idle keep-alive connection; reconnect once
+                raise GeminiConnectionError(str(e) or type(e).__name__) from e
+            except (OSError, http.client.HTTPException) as e:
+                raise self._connection_error(e) from e
+            STATS.count("request_bytes", len(payload))
+            return resp
+        raise GeminiConnectionError("connection closed")
+
+    def _send(
+        self, path: str, payload: bytes, compressed: bool
+    ) -> tuple[int, dict[str, str], bytes]:
+        resp = self._open(path, payload, self._headers(compressed))
+        try:
+            raw = resp.read()
+        except (OSError, http.client.HTTPException) as e:
+            raise self._connection_error(e) from e
+        if resp.will_close:
+            self.close()
+        STATS.count("response_bytes", len(raw))
+        resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+        if resp_headers.get("content-encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        return resp.status, resp_headers, raw
+
+    def _encode(self, body: dict) -> tuple[bytes, bytes, bool]:
+        """(plain JSON, payload to send, whether payload is gzip-compressed)."""
+        data = json.dumps(body).encode("utf-8")
+        compressed = self.gzip_requests and len(data) >= GZIP_MIN_BYTES
+        return data, gzip.compress(data, compresslevel=6) if compressed else data, compressed
+
+    @staticmethod
+    def _rejects_gzip(status: int, raw: bytes) -> bool:
+        """
+        True if the error response says the endpoint does not take gzip bodies: 415, or a 400
+        that mentions the content encoding (any other 400 is a real error, e.g. a bad key).
+        """
+        if status == 415:
+            return True
+        text = raw.lower()
+        return status == 400 and (b"content-encoding" in text or b"gzip" in text)
+
+    def post_json(self, path: str, body: dict) -> dict:
+        """POST body to base + path; parsed JSON on 200, GeminiHTTPError otherwise."""
+        data, payload, compressed = self._encode(body)
+        status, headers, raw = self._send(self.base_path + path, payload, compressed)
+        if compressed and self._rejects_gzip(status, raw):
+            # Endpoint does not take gzip bodies: send plain JSON from now on.
+            self.gzip_requests = False
+            status, headers, raw = self._send(self.base_path + path, data, False)
+        if status != 200:
+            raise GeminiHTTPError(status, raw.decode("utf-8", errors="replace"), headers)
+        return json.loads(raw.decode("utf-8"))
+
+    def generate(self, api_key: str, model: str, prompt: str, generation_config: dict) -> str:
+        """Response text for one generateContent request."""
+        body = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": generation_config,
+        }
+        return extract_text(self.post_json(f"/{model}:generateContent?key={api_key}", body))
+
+    def _read_error(self, resp: http.client.HTTPResponse) -> bytes:
+        """Body of a non-200 streaming response (not gzip'd: accept_gzip=False)."""
+        try:
+            raw = resp.read()
+        except (OSError, http.client.HTTPException) as e:
+            raise self._connection_error(e) from e
+        if resp.will_close:
+            self.close()
+        return raw
+
+    def stream_generate(
+        self, api_key: str, model: str, prompt: str, generation_config: dict
+    ) -> Iterator[str]:
+        """
+        Text pieces of one streamGenerateContent request (server-sent events) as they arrive.
+        Responses are not gzip'd here, so every event can be passed on as soon as it is read.
+        """
+        body = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": generation_config,
+        }
+        path = f"{self.base_path}/{model}:streamGenerateContent?alt=sse&key={api_key}"
+        data, payload, compressed = self._encode(body)
+        resp = self._open(path, payload, self._headers(compressed, accept_gzip=False))
+        if resp.status != 200:
+            raw = self._read_error(resp)
+            if compressed and self._rejects_gzip(resp.status, raw):
+                self.gzip_requests = False
+                resp = self._open(path, data, self._headers(False, accept_gzip=False))
+                if resp.status != 200:
+                    raw = self._read_error(resp)
+            if resp.status != 200:
+                headers = {k.lower(): v for k, v in resp.getheaders()}
+                raise GeminiHTTPError(resp.status, raw.decode("utf-8", errors="replace"), headers)
+
+        finished = False
+        try:
+            for event in _sse_events(resp):
+                if "error" in event:
+                    raise ValueError("Gemini stream error: " + json.dumps(event["error"])[:400])
+                try:
+                    candidate = event["candidates"][0]
+                except (KeyError, IndexError, TypeError):
+                    continue
+                parts = (candidate.get("content") or {}).get("parts") or []
+                text = "".join(str(part.get("text", "")) for part in parts)
+                if text:
+                    yield text
+                if candidate.get("finishReason"):
+                    finished = True
+            if not finished:
+                # The last event carries finishReason; without it the answer is cut off.
+                raise GeminiConnectionError("stream ended before the response was complete")
+        except (OSError, http.client.HTTPException) as e:
+            raise self._connection_error(e) from e
+        finally:
+            if not finished or resp.will_close:
+                self.close()  # a half-read response cannot be reused
+
+    async def agenerate(self, api_key: str, model: str, prompt: str, generation_config: dict) -> str:
+        """generate() in a worker thread, for asyncio callers."""
+        import asyncio  # only asyncio callers pay for the import
+
+        return await asyncio.to_thread(self.generate, api_key, model, prompt, generation_config)
+
+
+def _sse_events(resp: http.client.HTTPResponse) -> Iterator[dict]:
+    """JSON payloads of the "data:" fields of a server-sent event stream."""
+    data_lines: list[str] = []
+    while True:
+        line = resp.readline()
+        STATS.count("response_bytes", len(line))
+        text = line.decode("utf-8").rstrip("\r\n")
+        if text.startswith("data:"):
+            data_lines.append(text[5:].lstrip(" "))
+        elif not text and data_lines:
+            yield json.loads("\n".join(data_lines))
+            data_lines = []
+        if not line:
+            return
+
+
+_shared: GeminiClient | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_client() -> GeminiClient:
+    """Process-wide client for GEMINI_BASE, so every call reuses the same connections."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = GeminiClient(GEMINI_BASE)
+        return _shared
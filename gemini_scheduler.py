@@ -0,0 +1,180 @@
+"""
+Pacing for Gemini requests: requests-per-minute / tokens-per-minute token buckets and
+retry delays (exponential backoff with jitter, honoring Retry-After and RetryInfo).
+
+summary_report.py waits on a RateLimiter (when --rpm / --tpm are set) before every attempt
+and sleeps retry_delay(...) between attempts, from however many threads are sending.
+Backfills over many reports go through run_jobs, which records finished days in a Progress
+file.
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Callable
+
+from report_stats import CHARS_PER_TOKEN
+
+BACKOFF_BASE_S = 2.0
+BACKOFF_MAX_S = 60.0
+
+_RETRY_DELAY_RE = re.compile(r'"retryDelay"\s*:\s*"(\d+(?:\.\d+)?)s"')
+
+
+def estimate_tokens(prompt: str) -> int:
+    return len(prompt) // CHARS_PER_TOKEN + 1
+
+
+class TokenBucket:
+    """`per_minute` tokens per minute, at most `per_minute` saved up."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, n: float) -> float:
+        """Take n tokens now (the balance may go negative); seconds until they are covered."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= n
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class RateLimiter:
+    """RPM and TPM limits shared by all threads; 0 means no limit."""
+
+    def __init__(self, rpm: float = 0, tpm: float = 0):
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int) -> float:
+        """Block until a request of `tokens` tokens fits in both budgets; returns seconds waited."""
+        with self._lock:
+            wait = max(0.0, self.paused_until - time.monotonic())
+            if self.requests:
+                wait = max(wait, self.requests.reserve(1))
+            if self.tokens:
+                wait = max(wait, self.tokens.reserve(tokens))
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for `seconds` (the server asked us to slow down)."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def parse_retry_after(headers: dict[str, str], body: str = "") -> float | None:
+    """
+    Seconds the server asked us to wait: the Retry-After header (seconds or HTTP date), else
+    the RetryInfo "retryDelay" Gemini puts in 429 error bodies. None if neither is present.
+    """
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    m = _RETRY_DELAY_RE.search(body)
+    if m:
+        return float(m.group(1))
+    return None
+
+
+def retry_delay(attempt: int, server_delay: float | None = None) -> float:
+    """
+    Seconds to wait before attempt + 1: full-jitter exponential backoff
+    (random in [0, min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2 ** (attempt - 1))]),
+    but never less than what the server asked for.
+    """
+    backoff = random.uniform(0, min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2 ** (attempt - 1)))
+    if server_delay is not None:
+        return max(server_delay, backoff)
+    return backoff
+
+
+class Progress:
+    """
+    Finished jobs of a backfill, saved to a JSON file after each one, so an interrupted run
+    resumes without re-sending them. A job counts as done only for the same fingerprint
+    (e.g. a hash of its input) and while its output file still exists.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self.done: dict[str, dict] = data if isinstance(data, dict) else {}
+        self._lock = threading.Lock()
+
+    def is_done(self, key: str, fingerprint: str) -> bool:
+        entry = self.done.get(key)
+        return (
+            isinstance(entry, dict)
+            and entry.get("fingerprint") == fingerprint
+            and Path(entry.get("output", "")).is_file()
+        )
+
+    def mark_done(self, key: str, fingerprint: str, output: Path) -> None:
+        with self._lock:
+            self.done[key] = {
+                "fingerprint": fingerprint,
+                "output": str(output),
+                "finished": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                data = json.dumps(self.done, ensure_ascii=False, indent=1)
+                tmp_path.write_text(data, encoding="utf-8")
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass
+
+
+def run_jobs(
+    jobs: list[tuple[str, str, Callable[[], Path]]],
+    progress: Progress | None,
+    workers: int = 1,
+) -> tuple[list[str], list[tuple[str, str]]]:
+    """
+    Run (key, fingerprint, fn) jobs with up to `workers` at a time; fn does the work and
+    returns its output path. Jobs already done in `progress` are skipped, and a failing job
+    does not stop the others. Returns (skipped keys, [(failed key, error)]).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    skipped = [key for key, fp, _ in jobs if progress and progress.is_done(key, fp)]
+    todo = [job for job in jobs if job[0] not in set(skipped)]
+    failed: list[tuple[str, str]] = []
+
+    def run(job: tuple[str, str, Callable[[], Path]]) -> None:
+        key, fingerprint, fn = job
+        try:
+            output = fn()
+        except (Exception, SystemExit) as e:
+            failed.append((key, str(e)))
+            return
+        if progress:
+            progress.mark_done(key, fingerprint, output)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(run, todo))
+    return skipped, failed
@@ -16,8 +16,8 @@ import json
 import os
 import sys
 from pathlib import Path
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
+
+from gemini_client import GeminiConnectionError, GeminiHTTPError, shared_client
 
 
 # مدل پیش‌فرض؛ با GEMINI_MODEL می‌توانی عوضش کنی (مثلاً gemini-2.0-flash)
@@ -50,7 +50,6 @@ def build_prompt(report_content: str, date_gregorian: str) -> str:
 
 def call_gemini(api_key: str, prompt: str, model: str | None = None) -> str:
     model = model or os.environ.get("GEMINI_MODEL") or DEFAULT_MODEL
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
     body = {
         "contents": [{"parts": [{"text": prompt}]}],
         "generationConfig": {
@@ -58,19 +57,11 @@ def call_gemini(api_key: str, prompt: str, model: str | None = None) -> str:
             "maxOutputTokens": 2048,
         },
     }
-    req = Request(
-        url,
-        data=json.dumps(body).encode("utf-8"),
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
     try:
-        with urlopen(req, timeout=120) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-    except HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace")
-        raise SystemExit(f"خطای API جمنای (HTTP {e.code}): {body}")
-    except URLError as e:
+        data = shared_client().post_json(f"/{model}:generateContent?key={api_key}", body)
+    except GeminiHTTPError as e:
+        raise SystemExit(f"خطای API جمنای (HTTP {e.code}): {e.body}")
+    except GeminiConnectionError as e:
         raise SystemExit(f"خطای اتصال به جمنای: {e.reason}")
 
     try:
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Searchable history of all Cursor agent sessions: a local SQLite database with full-text
+search (FTS5) over every turn.
+
+Without a query, the index is brought up to date: only transcripts whose size or mtime changed
+since the last run are parsed again (through the parsed-transcript cache of
+cursor_daily_report.py). With a query, the index is searched without touching the transcripts.
+
+Usage:
+  python3 history_index.py                                   # update the index
+  python3 history_index.py migration --project myapp --from 2026-01-01 --to 2026-01-31
+  python3 history_index.py '"connection reset"' --role user --limit 50
+  python3 history_index.py timeout --update                  # update, then search
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import cursor_daily_report as cdr
+from report_stats import STATS, add_stats_argument, write_stats
+
+INDEX_PATH = cdr.CACHE_DIR / "history.sqlite3"
+# Bump when the schema changes; together with cdr.PARSER_VERSION it decides when the index is
+# rebuilt from scratch.
+INDEX_VERSION = 1
+DEFAULT_LIMIT = 20
+# Words of context around a hit in search results.
+SNIPPET_WORDS = 16
+
+_SCHEMA = """
+CREATE TABLE sessions (
+    id INTEGER PRIMARY KEY,
+    transcript TEXT NOT NULL UNIQUE,
+    slug TEXT NOT NULL,
+    project_path TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    mtime TEXT NOT NULL,
+    turns INTEGER NOT NULL
+);
+CREATE INDEX sessions_mtime ON sessions(mtime);
+CREATE TABLE turns (
+    id INTEGER PRIMARY KEY,
+    session INTEGER NOT NULL REFERENCES sessions(id),
+    n INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX turns_session ON turns(session);
+CREATE VIRTUAL TABLE turns_fts USING fts5(text, content='turns', content_rowid='id');
+CREATE TRIGGER turns_insert AFTER INSERT ON turns BEGIN
+    INSERT INTO turns_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER turns_delete AFTER DELETE ON turns BEGIN
+    INSERT INTO turns_fts(turns_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+def open_index(path: Path | None = None) -> sqlite3.Connection:
+    """The index database, created (or rebuilt after a version change) as needed."""
+    path = path or INDEX_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    version = INDEX_VERSION * 1000 + cdr.PARSER_VERSION
+    if conn.execute("PRAGMA user_version").fetchone()[0] != version:
+        with conn:
+            for name in ("turns_fts", "turns", "sessions"):
+                conn.execute(f"DROP TABLE IF EXISTS {name}")
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version={version}")
+    return conn
+
+
+def update_index(conn: sqlite3.Connection, use_cache: bool = True) -> tuple[int, int]:
+    """
+    Load new and changed transcripts into the index; unchanged ones (same size and mtime) are
+    skipped. Sessions whose transcript was deleted stay searchable. Returns (updated, unchanged).
+    """
+    known = {
+        transcript: (session, size, mtime_ns)
+        for session, transcript, size, mtime_ns in conn.execute(
+            "SELECT id, transcript, size, mtime_ns FROM sessions"
+        )
+    }
+    workspace_paths = cdr.get_workspace_paths(use_cache=use_cache)
+    updated = unchanged = 0
+    with conn:
+        for slug, txt_file, st in cdr.iter_transcript_files():
+            old = known.get(str(txt_file))
+            if old and old[1:] == (st.st_size, st.st_mtime_ns):
+                unchanged += 1
+                continue
+            try:
+                with STATS.stage("parse"):
+                    turns = cdr.load_transcript_turns(txt_file, st, use_cache=use_cache)
+            except Exception:
+                STATS.count("files_failed")
+                continue
+            row = (
+                slug,
+                workspace_paths.get(slug) or cdr.slug_to_path(slug),
+                txt_file.stem,
+                st.st_size,
+                st.st_mtime_ns,
+                datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                len(turns),
+            )
+            with STATS.stage("store"):
+                if old:
+                    session = old[0]
+                    conn.execute("DELETE FROM turns WHERE session = ?", (session,))
+                    conn.execute(
+                        "UPDATE sessions SET slug = ?, project_path = ?, session_id = ?, size = ?,"
+                        " mtime_ns = ?, mtime = ?, turns = ? WHERE id = ?",
+                        row + (session,),
+                    )
+                else:
+                    session = conn.execute(
+                        "INSERT INTO sessions (slug, project_path, session_id, size, mtime_ns,"
+                        " mtime, turns, transcript) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        row + (str(txt_file),),
+                    ).lastrowid
+                conn.executemany(
+                    "INSERT INTO turns (session, n, role, text) VALUES (?, ?, ?, ?)",
+                    [(session, n, role, text) for n, (role, text) in enumerate(turns, 1)],
+                )
+            updated += 1
+    STATS.count("sessions_updated", updated)
+    STATS.count("sessions_unchanged", unchanged)
+    return updated, unchanged
+
+
+def _quote_terms(query: str) -> str:
+    """A query with every word as a quoted FTS5 string, for input that is not valid syntax."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+def _escape_like(text: str) -> str:
+    """text for a LIKE pattern with ESCAPE '\\': "%", "_" and "\\" match themselves."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search(
+    conn: sqlite3.Connection,
+    query: str,
+    project: str | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    role: str | None = None,
+    limit: int = DEFAULT_LIMIT,
+) -> list[tuple[str, str, str, str, int, str, str]]:
+    """
+    Best matches of an FTS5 query, as (mtime, project, project path, session_id, turn number,
+    role, snippet). project matches part of the project name or path; the date range
+    (inclusive) applies to the session's last-modified day. ValueError for a query that is
+    blank or cannot be searched even with its words quoted.
+    """
+    if not query.strip():
+        raise ValueError("empty query")
+    sql = [
+        "SELECT s.mtime, s.slug, s.project_path, s.session_id, t.n, t.role,"
+        f" snippet(turns_fts, 0, '[', ']', '…', {SNIPPET_WORDS})"
+        " FROM turns_fts JOIN turns t ON t.id = turns_fts.rowid"
+        " JOIN sessions s ON s.id = t.session WHERE turns_fts MATCH ?"
+    ]
+    params: list = [query]
+    if project:
+        sql.append("AND (s.slug LIKE ? ESCAPE '\\' OR s.project_path LIKE ? ESCAPE '\\')")
+        params += [f"%{_escape_like(project)}%"] * 2
+    if date_from:
+        sql.append("AND s.mtime >= ?")
+        params.append(date_from.strftime("%Y-%m-%d"))
+    if date_to:
+        sql.append("AND s.mtime < ?")
+        params.append((date_to + timedelta(days=1)).strftime("%Y-%m-%d"))
+    if role:
+        sql.append("AND t.role = ?")
+        params.append(role)
+    sql.append("ORDER BY rank LIMIT ?")
+    params.append(limit)
+    try:
+        rows = conn.execute(" ".join(sql), params).fetchall()
+    except sqlite3.OperationalError:
+        params[0] = _quote_terms(query)
+        try:
+            rows = conn.execute(" ".join(sql), params).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"invalid query: {e}") from e
+    return [
+        (mtime, cdr.path_to_display_name(slug), path, session_id, n, role, snippet)
+        for mtime, slug, path, session_id, n, role, snippet in rows
+    ]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="Index all Cursor agent sessions in SQLite and search them."
+    )
+    ap.add_argument(
+        "query",
+        nargs="?",
+        default=None,
+        help="FTS5 query (words, \"phrases\", OR, prefix*). Without it, the index is updated.",
+    )
+    ap.add_argument(
+        "--project", default=None, help="Only projects whose name or path contains this."
+    )
+    ap.add_argument("--from", dest="date_from", default=None, help="First day YYYY-MM-DD.")
+    ap.add_argument("--to", dest="date_to", default=None, help="Last day YYYY-MM-DD (inclusive).")
+    ap.add_argument("--role", choices=("user", "assistant"), default=None, help="Only these turns.")
+    ap.add_argument(
+        "--limit", type=int, default=DEFAULT_LIMIT, help=f"Max results (default {DEFAULT_LIMIT})."
+    )
+    ap.add_argument("--update", action="store_true", help="Update the index before searching.")
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse changed transcripts without the parsed-transcript cache.",
+    )
+    ap.add_argument(
+        "--index",
+        default=None,
+        help=f"Database file (default: {INDEX_PATH.relative_to(cdr.CACHE_DIR.parent)}).",
+    )
+    add_stats_argument(ap)
+    args = ap.parse_args()
+    STATS.enabled = args.stats is not None
+
+    try:
+        date_from = datetime.strptime(args.date_from, "%Y-%m-%d") if args.date_from else None
+        date_to = datetime.strptime(args.date_to, "%Y-%m-%d") if args.date_to else None
+    except ValueError:
+        print("Invalid --from/--to; use YYYY-MM-DD.")
+        return
+    if args.query is not None and not args.query.strip():
+        print("Empty query. Usage: history_index.py QUERY [--project P] [--from D] [--to D];"
+              " without QUERY, the index is updated.")
+        return
+
+    conn = open_index(Path(args.index) if args.index else None)
+    if args.query is None or args.update:
+        t0 = time.perf_counter()
+        with STATS.stage("update"):
+            updated, unchanged = update_index(conn, use_cache=not args.no_cache)
+        print(
+            f"Index updated: {updated} sessions loaded, {unchanged} unchanged "
+            f"({time.perf_counter() - t0:.2f} s).",
+            file=sys.stderr,
+        )
+    if args.query is not None:
+        t0 = time.perf_counter()
+        with STATS.stage("search"):
+            try:
+                results = search(
+                    conn, args.query, project=args.project, date_from=date_from,
+                    date_to=date_to, role=args.role, limit=args.limit,
+                )
+            except ValueError as e:
+                print(f"Could not search for {args.query!r}: {e}")
+                conn.close()
+                return
+        for mtime, project, _, session_id, n, role, snippet in results:
+            snippet = " ".join(snippet.split())
+            print(f"{mtime[:16]}  {project}  {session_id} #{n} {role}: {snippet}")
+        print(
+            f"{len(results)} results ({(time.perf_counter() - t0) * 1000:.1f} ms).",
+            file=sys.stderr,
+        )
+    conn.close()
+    write_stats(args.stats)
+
+
+if __name__ == "__main__":
+    main()
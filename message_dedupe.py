@@ -0,0 +1,103 @@
+"""
+Collapsing of repeated user messages within a project (cursor_daily_report.py --dedupe).
+
+People retype the same request in several chats ("fix the test", "again") or paste the same
+error log with a few lines changed. Messages that are equal after folding case and whitespace,
+or whose word shingles overlap by at least SIMILARITY_THRESHOLD, are grouped so the report
+lists each request once with a count. Near-duplicate candidates come from MinHash signatures
+(banded, so each message is only compared with likely matches) and are confirmed with the
+exact Jaccard similarity of the shingle sets.
+"""
+
+import random
+import re
+import zlib
+
+# Words per shingle; messages with fewer words are only matched exactly.
+SHINGLE_WORDS = 3
+# MinHash signature length, split into LSH_BANDS bands of equal size. A pair with
+# similarity 0.8 shares a band with probability > 0.99, one with 0.3 about 0.24.
+MINHASH_PERMUTATIONS = 30
+LSH_BANDS = 10
+SIMILARITY_THRESHOLD = 0.8
+
+_WORD_RE = re.compile(r"\w+")
+# Numbers that vary between pastes of the same log: traceback line numbers ("line 42"),
+# path:line and hh:mm:ss parts, and hex addresses and hashes. Other numbers ("timeout 30")
+# are part of the request and kept.
+_LOG_NUMBER_RE = re.compile(
+    r"(?<=line )\d+|\d+(?=:\d)|(?<=:)\d+|\b0x[0-9a-f]+\b"
+    r"|\b(?=[0-9a-f]*\d)(?=[0-9a-f]*[a-f])[0-9a-f]{7,}\b"
+)
+# Fixed seed: the same messages always collapse the same way.
+_MASKS = random.Random(0).sample(range(1 << 32), MINHASH_PERMUTATIONS)
+
+
+def normalize(text: str) -> str:
+    """Case-folded text with runs of whitespace made single spaces."""
+    return " ".join(text.casefold().split())
+
+
+def shingles(text: str) -> frozenset[int]:
+    """
+    Hashes of the SHINGLE_WORDS-word sequences of text (empty for shorter texts). Log-like
+    numbers (_LOG_NUMBER_RE) all count as "0", so a log pasted again with other line numbers
+    or addresses still matches.
+    """
+    words = _WORD_RE.findall(_LOG_NUMBER_RE.sub("0", text.casefold()))
+    return frozenset(
+        zlib.crc32(" ".join(words[i:i + SHINGLE_WORDS]).encode("utf-8"))
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    )
+
+
+def minhash(hashes: frozenset[int]) -> tuple[int, ...]:
+    """MINHASH_PERMUTATIONS minimums over the shingle hashes, one per XOR mask."""
+    return tuple(min(map(mask.__xor__, hashes)) for mask in _MASKS)
+
+
+def jaccard(a: frozenset[int], b: frozenset[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def group_duplicates(messages: list[str]) -> list[int]:
+    """
+    For each message, the index of the first message it repeats (its own index if it is
+    new). Exact repeats are matched after normalize(); near-duplicates by shingle similarity.
+    """
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    first_exact: dict[str, int] = {}
+    buckets: dict[tuple, list[int]] = {}
+    sets: dict[int, frozenset[int]] = {}
+    groups = []
+    for i, message in enumerate(messages):
+        key = normalize(message)
+        if key in first_exact:
+            groups.append(first_exact[key])
+            continue
+        hashes = shingles(message)
+        bands = []
+        match = None
+        if hashes:
+            signature = minhash(hashes)
+            bands = [(b, signature[b * rows:(b + 1) * rows]) for b in range(LSH_BANDS)]
+            for band in bands:
+                for j in buckets.get(band, ()):
+                    if jaccard(hashes, sets[j]) >= SIMILARITY_THRESHOLD:
+                        match = j
+                        break
+                if match is not None:
+                    break
+        if match is not None:
+            first_exact[key] = match
+            groups.append(match)
+            continue
+        first_exact[key] = i
+        groups.append(i)
+        if hashes:
+            sets[i] = hashes
+            for band in bands:
+                buckets.setdefault(band, []).append(i)
+    return groups
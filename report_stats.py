@@ -0,0 +1,201 @@
+"""
+Run statistics for cursor_daily_report.py and summary_report.py (--stats).
+
+A single module-level STATS object collects wall/CPU time per stage, counters, samples
+(e.g. HTTP latency per request) and the slowest transcripts. Everything is a no-op until
+STATS.enabled is set, so the instrumentation stays in place in normal runs.
+"""
+
+import heapq
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+_END = object()
+
+# Number of slowest transcripts kept.
+SLOWEST_FILES = 10
+# Rough prompt size in tokens (Gemini TPM pacing, dedupe savings); Persian text is denser
+# than English.
+CHARS_PER_TOKEN = 3
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()  # summary_report records from several threads
+        self.reset()
+
+    def reset(self) -> None:
+        self.stages: dict[str, list[float]] = {}  # name -> [wall_s, cpu_s, calls]
+        self.counters: dict[str, int] = {}
+        self.samples: dict[str, list[float]] = {}
+        self.values: dict[str, object] = {}
+        self.slowest: list[tuple[float, int, str]] = []  # min-heap of (seconds, bytes, path)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block; repeated or nested use of the same name adds up."""
+        if not self.enabled:
+            yield
+            return
+        wall0 = time.perf_counter()
+        cpu0 = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall0
+            cpu = time.process_time() - cpu0
+            with self._lock:
+                entry = self.stages.setdefault(name, [0.0, 0.0, 0])
+                entry[0] += wall
+                entry[1] += cpu
+                entry[2] += 1
+
+    def iter_stage(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """
+        Yield items, timing only the work of producing each one as stage name, not what the
+        consumer does between items.
+        """
+        if not self.enabled:
+            yield from items
+            return
+        it = iter(items)
+        while True:
+            with self.stage(name):
+                item = next(it, _END)
+            if item is _END:
+                return
+            yield item
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, value: float) -> None:
+        if self.enabled:
+            with self._lock:
+                self.samples.setdefault(name, []).append(value)
+
+    def set(self, name: str, value: object) -> None:
+        if self.enabled:
+            with self._lock:
+                self.values[name] = value
+
+    def file(self, path: str, seconds: float, nbytes: int) -> None:
+        """Record how long one transcript took; only the SLOWEST_FILES slowest are kept."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._keep_slowest((seconds, nbytes, str(path)))
+
+    def _keep_slowest(self, item: tuple[float, int, str]) -> None:
+        """Add to the slowest-files heap; the caller holds self._lock."""
+        if len(self.slowest) < SLOWEST_FILES:
+            heapq.heappush(self.slowest, item)
+        elif item > self.slowest[0]:
+            heapq.heapreplace(self.slowest, item)
+
+    def drain(self) -> dict | None:
+        """Snapshot for merge() in another process, and start over (None when disabled)."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            state = {
+                "stages": self.stages,
+                "counters": self.counters,
+                "samples": self.samples,
+                "values": self.values,
+                "slowest": self.slowest,
+            }
+            self.reset()
+        return state
+
+    def merge(self, state: dict | None) -> None:
+        """Add a drain() snapshot, e.g. from a worker process."""
+        if not self.enabled or not state:
+            return
+        with self._lock:
+            for name, (wall, cpu, calls) in state["stages"].items():
+                entry = self.stages.setdefault(name, [0.0, 0.0, 0])
+                entry[0] += wall
+                entry[1] += cpu
+                entry[2] += calls
+            for name, n in state["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + n
+            for name, values in state["samples"].items():
+                self.samples.setdefault(name, []).extend(values)
+            self.values.update(state["values"])
+            for item in state["slowest"]:
+                self._keep_slowest(tuple(item))
+
+    def as_dict(self) -> dict:
+        return {
+            "stages": {
+                name: {"wall_s": wall, "cpu_s": cpu, "calls": calls}
+                for name, (wall, cpu, calls) in self.stages.items()
+            },
+            "counters": dict(self.counters),
+            "samples": {
+                name: {"count": len(v), "total": sum(v), "max": max(v)}
+                for name, v in self.samples.items()
+                if v
+            },
+            "values": dict(self.values),
+            "slowest_files": [
+                {"path": path, "seconds": seconds, "bytes": nbytes}
+                for seconds, nbytes, path in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+    def format_table(self) -> str:
+        data = self.as_dict()
+        lines = [f"{'stage':<24} {'wall s':>9} {'cpu s':>9} {'calls':>7}"]
+        for name, s in data["stages"].items():
+            lines.append(f"{name:<24} {s['wall_s']:>9.3f} {s['cpu_s']:>9.3f} {s['calls']:>7}")
+        if data["counters"] or data["values"]:
+            lines.append("")
+            for name, n in {**data["counters"], **data["values"]}.items():
+                lines.append(f"{name:<24} {n}")
+        if data["samples"]:
+            lines.append("")
+            lines.append(f"{'sample':<24} {'count':>7} {'total':>9} {'max':>9}")
+            for name, s in data["samples"].items():
+                lines.append(f"{name:<24} {s['count']:>7} {s['total']:>9.3f} {s['max']:>9.3f}")
+        if data["slowest_files"]:
+            lines.append("")
+            lines.append("slowest files:")
+            for f in data["slowest_files"]:
+                lines.append(f"  {f['seconds'] * 1000:>9.1f} ms {f['bytes']:>11} B  {f['path']}")
+        return "\n".join(lines)
+
+
+STATS = Stats()
+
+
+def add_stats_argument(parser) -> None:
+    """The shared --stats [PATH] option (see write_stats)."""
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Record per-stage timings and I/O; print a table to stderr, or write JSON to PATH.",
+    )
+
+
+def write_stats(target: str | None) -> None:
+    """Print STATS as a table to stderr (target "") or write them as JSON to target."""
+    if target is None or not STATS.enabled:
+        return
+    if target:
+        Path(target).write_text(json.dumps(STATS.as_dict(), indent=2), encoding="utf-8")
+    else:
+        print(STATS.format_table(), file=sys.stderr)
@@ -1,29 +1,68 @@
 #!/usr/bin/env python3
 """
 Send Cursor daily raw report to Google Gemini API and save a short work summary
-(with Jalali date). Uses only standard library (urllib, json) — no extra packages.
+(with Jalali date). Uses only standard library (http.client, json) — no extra packages.
 
 Usage:
   python3 summary_report.py                    # today's report
   python3 summary_report.py reports/cursor-report-2026-02-01.md
+  python3 summary_report.py cursor-sessions-2026-02-01.jsonl   # session export as input
+  python3 summary_report.py --stream           # print the summary as Gemini writes it
+  python3 summary_report.py --map-reduce --workers 8   # one request per project, merged
+  python3 summary_report.py --from 2026-01-01 --to 2026-01-31 --rpm 10   # paced backfill
 
 Output: reports/summary-report-YYYY-MM-DD.md
 API key is read from .env (GEMINI_API_KEY) or --api-key.
 """
 
 import argparse
+import hashlib
 import json
 import os
+import re
 import sys
+import threading
+import time
 from pathlib import Path
-import urllib.request
-import urllib.error
+from typing import Callable
+
+from gemini_client import GeminiConnectionError, GeminiHTTPError, shared_client
+from gemini_scheduler import (
+    Progress,
+    RateLimiter,
+    estimate_tokens,
+    parse_retry_after,
+    retry_delay,
+    run_jobs,
+)
+from report_stats import CHARS_PER_TOKEN, STATS, add_stats_argument, write_stats
 
 
-GEMINI_BASE = "https://generativelanguage.googleapis.com/v1beta/models"
 DEFAULT_MODEL = "gemini-2.5-flash"
-REQUEST_TIMEOUT = 120
 MAX_RETRIES = 3
+GENERATION_CONFIG = {
+    "temperature": 0.3,
+    "maxOutputTokens": 8192,
+}
+# Gemini responses keyed by sha256 of (model, prompt, GENERATION_CONFIG); least recently
+# used entries are deleted once the folder is larger than GEMINI_CACHE_MAX_BYTES.
+GEMINI_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "gemini"
+GEMINI_CACHE_MAX_BYTES = 50 * 1024 * 1024
+# Days already summarized by a multi-report backfill (see gemini_scheduler.Progress).
+PROGRESS_PATH = Path(__file__).resolve().parent / ".cache" / "summary-progress.json"
+# Set by main from --rpm / --tpm; every Gemini attempt waits on it. None = not paced.
+RATE_LIMITER: RateLimiter | None = None
+# --map-reduce: concurrent per-project requests, and the largest piece of a project section
+# sent in one request (bigger sections are split between "### Chat" blocks).
+DEFAULT_WORKERS = 4
+MAP_MAX_CHARS = 200_000
+# Single-prompt mode: prompts are cut down to about this many tokens (estimate_tokens), newest
+# chats first; 0 = no limit. --max-prompt-tokens / GEMINI_MAX_PROMPT_TOKENS override it.
+PROMPT_MAX_TOKENS = 250_000
+# A chat cut shorter than this many tokens is left out instead.
+PROMPT_MIN_CUT_TOKENS = 50
+
+_CHAT_HEADING_RE = re.compile(r"### Chat \d+ — (\d{4}-\d{2}-\d{2} \d{2}:\d{2})")
 
 
 def load_dotenv(env_path: Path) -> None:
@@ -46,7 +85,44 @@ def load_report(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
-def build_prompt(report_content: str, date_gregorian: str) -> str:
+def load_sessions_report(path: Path) -> tuple[str, str]:
+    """
+    (YYYY-MM-DD, raw report) for a session export (cursor_daily_report.py --jsonl): the report
+    is rendered from the exported turns, with repeated requests collapsed.
+    """
+    from datetime import datetime
+
+    import cursor_daily_report
+
+    meta, rows = cursor_daily_report.read_sessions_jsonl(path)
+    date_gregorian = meta.get("report_date") or report_date(path)
+    if date_gregorian == "today":
+        day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    else:
+        day = datetime.strptime(date_gregorian, "%Y-%m-%d")
+    report_content = cursor_daily_report.build_report(
+        day, meta.get("start_hour", 3), meta.get("end_hour", 1), rows=rows, dedupe=True
+    )
+    return day.strftime("%Y-%m-%d"), report_content
+
+
+def build_prompt(report_content: str, date_gregorian: str, max_tokens: int = 0) -> str:
+    """
+    Summary prompt for a raw report. With max_tokens, a report that would make the prompt
+    longer is cut down by fit_report, and the prompt says what was left out.
+    """
+    note = ""
+    if max_tokens:
+        overhead = estimate_tokens(build_prompt("", date_gregorian))
+        overhead += estimate_tokens(_elision_note(max_tokens, 10**6, 10**6, 10**9))
+        report_content, omitted, trimmed, elided_tokens = fit_report(
+            report_content, max(0, max_tokens - overhead)
+        )
+        if omitted or trimmed:
+            note = _elision_note(max_tokens, omitted, trimmed, elided_tokens)
+            STATS.set("prompt_chats_omitted", omitted)
+            STATS.set("prompt_chats_trimmed", trimmed)
+            STATS.set("prompt_tokens_elided", elided_tokens)
     return f"""این متن یک گزارش خام از تمام چت‌های Cursor در تاریخ {date_gregorian} است (با جزئیات هر پروژه و هر مکالمه).
 
 وظیفهٔ تو:
@@ -59,64 +135,585 @@ def build_prompt(report_content: str, date_gregorian: str) -> str:
 
 فقط خروجی نهایی گزارش را بنویس، بدون توضیح اضافه یا «بله، گزارش به این شکل است» و امثال آن.
 
----
+{note}---
 متن گزارش خام:
 ---
 {report_content}
 """
 
 
-def _request_one(api_key: str, prompt: str, model: str) -> str:
-    url = f"{GEMINI_BASE}/{model}:generateContent?key={api_key}"
-    body = {
-        "contents": [
-            {"parts": [{"text": prompt}]}
-        ],
-        "generationConfig": {
-            "temperature": 0.3,
-            "maxOutputTokens": 8192,
-        },
-    }
-    data = json.dumps(body).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-    with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as resp:
-        out = json.loads(resp.read().decode("utf-8"))
+def _elision_note(max_tokens: int, omitted: int, trimmed: int, elided_tokens: int) -> str:
+    return (
+        f"توجه: گزارش خام برای جا شدن در سقف {max_tokens} توکن کوتاه شده است؛ "
+        f"{omitted} گفتگوی قدیمی‌تر کامل حذف و {trimmed} گفتگو کوتاه شده "
+        f"(حدود {elided_tokens} توکن). نام همهٔ پروژه‌ها باقی مانده است؛ "
+        "برای پروژه‌هایی که گفتگویی از آن‌ها نمانده فقط بنویس که روی آن کار شده.\n\n"
+    )
+
+
+def _report_line_kinds(lines: list[str]) -> list[str | None]:
+    """
+    For each line of a raw report (or a section of one), "project" for a project heading
+    cursor_daily_report emitted, "chat" for a chat heading, else None. A project heading is a
+    "## " line followed by a blank line and "**Path:**"; a chat heading comes after the path
+    or the previous chat's "---" and a blank line. Fenced --full chat text (a fence line
+    after a "**User**"/"**Assistant**" label) is skipped, so "## " or "### Chat" lines inside
+    it, or inside a request preview, never split the report.
+    """
+    kinds: list[str | None] = [None] * len(lines)
+    fence = ""
+    for i, line in enumerate(lines):
+        text = line.rstrip("\n")
+        if fence:
+            if text == fence:
+                fence = ""
+            continue
+        if (text.startswith("```") and not text.strip("`") and i >= 2
+                and lines[i - 1].strip() == ""
+                and lines[i - 2].strip() in ("**User**", "**Assistant**")):
+            fence = text
+        elif (text.startswith("## ") and i + 2 < len(lines) and not lines[i + 1].strip()
+                and lines[i + 2].startswith("**Path:** `")):
+            kinds[i] = "project"
+        elif (_CHAT_HEADING_RE.match(text) and i >= 2 and not lines[i - 1].strip()
+                and (lines[i - 2].rstrip("\n") == "---" or lines[i - 2].startswith("**Path:** `"))):
+            kinds[i] = "chat"
+    return kinds
+
+
+def split_report_sections(report_content: str) -> tuple[str, list[tuple[str, str]]]:
+    """
+    Split a raw report into (header, [(project name, section text)]); a section starts at a
+    project heading and runs to the next one (see _report_line_kinds).
+    """
+    lines = report_content.splitlines(keepends=True)
+    header_lines: list[str] = []
+    sections: list[tuple[str, list[str]]] = []
+    for line, kind in zip(lines, _report_line_kinds(lines)):
+        if kind == "project":
+            sections.append((line[3:].strip(), [line]))
+        elif sections:
+            sections[-1][1].append(line)
+        else:
+            header_lines.append(line)
+    return "".join(header_lines), [(name, "".join(lines)) for name, lines in sections]
+
+
+def split_chats(section: str) -> tuple[str, list[str]]:
+    """Split a project section into (heading and path, ["### Chat" blocks])."""
+    lines = section.splitlines(keepends=True)
+    head: list[str] = []
+    chats: list[list[str]] = []
+    for line, kind in zip(lines, _report_line_kinds(lines)):
+        if kind == "chat":
+            chats.append([line])
+        elif chats:
+            chats[-1].append(line)
+        else:
+            head.append(line)
+    return "".join(head), ["".join(lines) for lines in chats]
+
+
+def _cut_lines(text: str, max_chars: int) -> str:
+    """Leading whole lines of text, at most max_chars in total."""
+    out: list[str] = []
+    size = 0
+    for line in text.splitlines(keepends=True):
+        if size + len(line) > max_chars:
+            break
+        out.append(line)
+        size += len(line)
+    return "".join(out)
+
+
+def fit_report(report_content: str, max_tokens: int) -> tuple[str, int, int, int]:
+    """
+    Cut a raw report down to about max_tokens (estimate_tokens). The header and every
+    project's heading and path are always kept. Then chats are added newest first: first
+    their request lists, then, while there is room, their full text (--full reports). A
+    request list that does not fit is cut at a line; full text is kept whole or left out.
+    Returns (report, chats left out, chats shortened, tokens left out).
+    """
+    original_tokens = estimate_tokens(report_content)
+    if original_tokens <= max_tokens:
+        return report_content, 0, 0, 0
+    header, sections = split_report_sections(report_content)
+    heads: list[str] = []
+    parts: list[list[tuple[str, str]]] = []  # per project, per chat: (request list, full text)
+    order: list[tuple[str, int, int]] = []
+    for p, (_, section) in enumerate(sections):
+        head, chats = split_chats(section)
+        heads.append(head)
+        parts.append([])
+        for c, chat in enumerate(chats):
+            requests, specs, full = chat.partition("**Specs:**\n")
+            parts[p].append((requests, specs + full))
+            order.append((_CHAT_HEADING_RE.match(chat).group(1), p, c))
+    order.sort(reverse=True)  # newest first; later chats of a project win ties
+
+    budget = max_tokens - estimate_tokens(header) - sum(estimate_tokens(h) for h in heads)
+    kept: dict[tuple[int, int], list[str]] = {}
+    shortened: set[tuple[int, int]] = set()
+    for tier in (0, 1):
+        for _, p, c in order:
+            text = parts[p][c][tier]
+            if not text or (tier == 1 and kept.get((p, c)) != [parts[p][c][0]]):
+                continue
+            cost = estimate_tokens(text)
+            if cost <= budget:
+                kept.setdefault((p, c), []).append(text)
+                budget -= cost
+                continue
+            shortened.add((p, c))
+            if tier == 0 and budget >= PROMPT_MIN_CUT_TOKENS:
+                cut = _cut_lines(text, (budget - PROMPT_MIN_CUT_TOKENS) * CHARS_PER_TOKEN)
+                if cut.strip():
+                    kept[(p, c)] = [cut + "[…]\n\n"]
+                    budget -= estimate_tokens(kept[(p, c)][0])
+
+    out = [header]
+    for p, head in enumerate(heads):
+        out.append(head)
+        for c in range(len(parts[p])):
+            out.extend(kept.get((p, c), []))
+    report = "".join(out)
+    omitted = sum(len(chats) for chats in parts) - len(kept)
+    trimmed = len(shortened & kept.keys())
+    return report, omitted, trimmed, max(0, original_tokens - estimate_tokens(report))
+
+
+def split_section(section: str, max_chars: int = MAP_MAX_CHARS) -> list[str]:
+    """Cut a project section into pieces of at most about max_chars, between "### Chat" blocks."""
+    if len(section) <= max_chars:
+        return [section]
+    pieces: list[str] = []
+    current: list[str] = []
+    size = 0
+    lines = section.splitlines(keepends=True)
+    for line, kind in zip(lines, _report_line_kinds(lines)):
+        if kind == "chat" and current and size + len(line) > max_chars:
+            pieces.append("".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line)
+    if current:
+        pieces.append("".join(current))
+    return pieces
+
+
+def build_project_prompt(section: str, date_gregorian: str) -> str:
+    return f"""این متن بخشی از گزارش خام چت‌های Cursor در تاریخ {date_gregorian} است و فقط مربوط به **یک پروژه** است.
+
+برای این پروژه به فارسی و خیلی کوتاه (یک یا دو خط) بنویس که آن روز چه کاری انجام شده، بدون اصطلاحات فنی زیاد.
+**اسم فایل‌هایی که ویرایش یا ساخته شده** را هم بنویس.
+تاریخ و عنوان کلی ننویس؛ فقط خلاصهٔ همین پروژه را بنویس، بدون توضیح اضافه.
+
+---
+{section}
+"""
+
+
+def build_reduce_prompt(project_summaries: list[tuple[str, str]], date_gregorian: str) -> str:
+    summaries = "\n\n".join(f"## {name}\n{summary}" for name, summary in project_summaries)
+    return f"""این‌ها خلاصهٔ کارهای هر پروژه در Cursor در تاریخ {date_gregorian} است.
+
+از روی آن‌ها یک **گزارش کار روزانه** خیلی کوتاه و تمیز به فارسی بنویس:
+1. در همان اول گزارش، **تاریخ را به شمسی (جلالی)** بنویس.
+2. برای **همهٔ پروژه‌ها** یک بخش جداگانه بنویس؛ هیچ پروژه‌ای را حذف نکن.
+3. اسم فایل‌ها را نگه دار و از کلمات ساده استفاده کن.
+
+فقط خروجی نهایی گزارش را بنویس، بدون توضیح اضافه.
+
+---
+{summaries}
+"""
+
+
+def gregorian_to_jalali(year: int, month: int, day: int) -> tuple[int, int, int]:
+    """Convert a Gregorian date to the Jalali (Persian) calendar."""
+    days_before_month = [0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334]
+    gy = year - 1600
+    gm = month - 1
+    gd = day - 1
+    g_day_no = 365 * gy + (gy + 3) // 4 - (gy + 99) // 100 + (gy + 399) // 400
+    g_day_no += days_before_month[gm] + gd
+    if gm > 1 and ((year % 4 == 0 and year % 100 != 0) or year % 400 == 0):
+        g_day_no += 1
+    j_day_no = g_day_no - 79
+    j_np = j_day_no // 12053
+    j_day_no %= 12053
+    jy = 979 + 33 * j_np + 4 * (j_day_no // 1461)
+    j_day_no %= 1461
+    if j_day_no >= 366:
+        jy += (j_day_no - 1) // 365
+        j_day_no = (j_day_no - 1) % 365
+    if j_day_no < 186:
+        return jy, 1 + j_day_no // 31, 1 + j_day_no % 31
+    return jy, 7 + (j_day_no - 186) // 30, 1 + (j_day_no - 186) % 30
+
+
+def merge_summaries_local(project_summaries: list[tuple[str, str]], date_gregorian: str) -> str:
+    """Reduce step without a Gemini call: Jalali date heading plus one section per project."""
     try:
-        text = out["candidates"][0]["content"]["parts"][0]["text"]
-    except (KeyError, IndexError) as e:
-        raise ValueError("Invalid Gemini response: " + json.dumps(out, ensure_ascii=False)[:400]) from e
-    if not (text and str(text).strip()):
-        raise ValueError("Gemini returned empty text.")
-    return str(text).strip()
+        if date_gregorian == "today":
+            from datetime import date
+
+            date_gregorian = date.today().isoformat()
+        y, m, d = (int(x) for x in date_gregorian.split("-"))
+        jy, jm, jd = gregorian_to_jalali(y, m, d)
+        title = f"# گزارش کار روزانه — {jy:04d}/{jm:02d}/{jd:02d}"
+    except ValueError:
+        title = "# گزارش کار روزانه"
+    parts = [title, ""]
+    for name, summary in project_summaries:
+        parts.extend([f"## {name}", "", summary.strip(), ""])
+    return "\n".join(parts).rstrip() + "\n"
+
 
+def summarize_map_reduce(
+    api_key: str,
+    report_content: str,
+    date_gregorian: str,
+    model: str | None = None,
+    workers: int = DEFAULT_WORKERS,
+    reduce: str = "gemini",
+    use_cache: bool = True,
+    on_chunk: Callable[[str], None] | None = None,
+    max_prompt_tokens: int = PROMPT_MAX_TOKENS,
+) -> str:
+    """
+    Summarize each "## project" section in its own request (up to `workers` at a time),
+    then merge the project summaries with one short Gemini call (reduce="gemini") or
+    locally (reduce="local"). A report without project sections goes out as one prompt.
+    With use_cache, each request is cached on its own, so a rerun only re-sends the projects
+    whose section changed. on_chunk receives the final summary only (see call_gemini).
+    """
+    from concurrent.futures import ThreadPoolExecutor
 
-def call_gemini(api_key: str, prompt: str, model: str | None = None) -> str:
+    _, sections = split_report_sections(report_content)
+    if not sections:
+        return call_gemini(
+            api_key, build_prompt(report_content, date_gregorian, max_prompt_tokens), model=model,
+            use_cache=use_cache, on_chunk=on_chunk,
+        )
+    jobs = [
+        (name, piece) for name, section in sections for piece in split_section(section)
+    ]
+    STATS.set("map_sections", len(sections))
+    STATS.set("map_requests", len(jobs))
+    with STATS.stage("map"):
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            results = list(pool.map(
+                lambda job: call_gemini(
+                    api_key, build_project_prompt(job[1], date_gregorian), model, use_cache
+                ),
+                jobs,
+            ))
+    by_project: dict[str, list[str]] = {}
+    for (name, _), summary in zip(jobs, results):
+        by_project.setdefault(name, []).append(summary)
+    project_summaries = [(name, "\n".join(parts)) for name, parts in by_project.items()]
+    with STATS.stage("reduce"):
+        if reduce == "local":
+            summary = merge_summaries_local(project_summaries, date_gregorian)
+            if on_chunk:
+                on_chunk(summary)
+            return summary
+        return call_gemini(
+            api_key, build_reduce_prompt(project_summaries, date_gregorian), model, use_cache,
+            on_chunk=on_chunk,
+        )
+
+
+def gemini_cache_key(model: str, prompt: str) -> str:
+    data = json.dumps(
+        {"model": model, "prompt": prompt, "generationConfig": GENERATION_CONFIG},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _read_gemini_cache(key: str) -> str | None:
+    path = GEMINI_CACHE_DIR / f"{key}.json"
+    try:
+        text = json.loads(path.read_text(encoding="utf-8"))["text"]
+        os.utime(path)  # mark as recently used
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return text if isinstance(text, str) and text else None
+
+
+def _write_gemini_cache(key: str, model: str, text: str) -> None:
+    path = GEMINI_CACHE_DIR / f"{key}.json"
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        GEMINI_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({"model": model, "text": text}, ensure_ascii=False)
+        tmp_path.write_text(data, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def evict_gemini_cache(max_bytes: int = GEMINI_CACHE_MAX_BYTES) -> int:
+    """Delete least recently used cache entries until the cache fits in max_bytes; returns count."""
+    entries = []
+    try:
+        for entry in os.scandir(GEMINI_CACHE_DIR):
+            if entry.name.endswith(".json"):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return 0
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def call_gemini(
+    api_key: str,
+    prompt: str,
+    model: str | None = None,
+    use_cache: bool = True,
+    on_chunk: Callable[[str], None] | None = None,
+) -> str:
+    """
+    Gemini response text for prompt. With use_cache, an identical earlier request (same model,
+    prompt and GENERATION_CONFIG) is answered from GEMINI_CACHE_DIR without calling the API.
+    With on_chunk, the response is streamed (streamGenerateContent) and on_chunk gets each
+    piece as it arrives; a cached response is passed to it in one piece.
+    """
     current_model = model or os.environ.get("GEMINI_MODEL") or DEFAULT_MODEL
+    key = gemini_cache_key(current_model, prompt) if use_cache else None
+    if key:
+        cached = _read_gemini_cache(key)
+        if cached is not None:
+            STATS.count("gemini_cache_hits")
+            if on_chunk:
+                on_chunk(cached)
+            return cached
+        STATS.count("gemini_cache_misses")
+    text = _call_gemini_api(api_key, prompt, current_model, on_chunk)
+    if key:
+        _write_gemini_cache(key, current_model, text)
+    return text
+
+
+def _call_gemini_api(
+    api_key: str,
+    prompt: str,
+    current_model: str,
+    on_chunk: Callable[[str], None] | None = None,
+) -> str:
+    """
+    One generateContent call (streamGenerateContent with on_chunk) with retries: 429/503 and
+    timeouts are retried after retry_delay (backoff with jitter, at least the server's
+    Retry-After), and every attempt first waits for RATE_LIMITER. A stream that fails after
+    some text was passed on is not retried, since the text cannot be taken back.
+    """
+    tokens = estimate_tokens(prompt)
+    pieces: list[str] = []
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            if attempt > 1:
-                print(f"  Retry ({attempt}/{MAX_RETRIES})...")
-            return _request_one(api_key, prompt, current_model)
-        except urllib.error.HTTPError as e:
-            err_body = e.read().decode("utf-8", errors="replace")
+            if RATE_LIMITER is not None:
+                waited = RATE_LIMITER.acquire(tokens)
+                if waited:
+                    STATS.observe("rate_limit_wait_s", waited)
+            STATS.count("gemini_requests")
+            t0 = time.perf_counter()
+            try:
+                if on_chunk is None:
+                    return shared_client().generate(
+                        api_key, current_model, prompt, GENERATION_CONFIG
+                    )
+                for piece in shared_client().stream_generate(
+                    api_key, current_model, prompt, GENERATION_CONFIG
+                ):
+                    if not pieces:
+                        STATS.observe("gemini_first_chunk_s", time.perf_counter() - t0)
+                    pieces.append(piece)
+                    on_chunk(piece)
+                text = "".join(pieces).strip()
+                if not text:
+                    raise ValueError("Gemini returned empty text.")
+                return text
+            finally:
+                STATS.observe("gemini_http_s", time.perf_counter() - t0)
+        except GeminiHTTPError as e:
+            STATS.count(f"gemini_http_{e.code}")
             if attempt < MAX_RETRIES and e.code in (429, 503):
+                server_delay = parse_retry_after(e.headers, e.body)
+                if server_delay is not None and RATE_LIMITER is not None:
+                    RATE_LIMITER.pause(server_delay)
+                _wait_before_retry(attempt, server_delay)
+                continue
+            raise SystemExit(f"Gemini API error (HTTP {e.code}): {e.body}")
+        except GeminiConnectionError as e:
+            if e.timeout and attempt < MAX_RETRIES and not pieces:
+                _wait_before_retry(attempt)
                 continue
-            raise SystemExit(f"Gemini API error (HTTP {e.code}): {err_body}")
-        except urllib.error.URLError as e:
-            if "timed out" in str(e.reason).lower() or "timeout" in str(e.reason).lower():
-                if attempt < MAX_RETRIES:
-                    continue
+            if pieces:
+                raise SystemExit(f"Connection error after partial output: {e.reason}")
             raise SystemExit(f"Connection error: {e.reason}")
         except ValueError as e:
             raise SystemExit(str(e))
     raise SystemExit("Request failed after retries.")
 
 
+def _wait_before_retry(attempt: int, server_delay: float | None = None) -> None:
+    delay = retry_delay(attempt, server_delay)
+    print(f"  Retry ({attempt + 1}/{MAX_RETRIES}) in {delay:.1f} s...")
+    STATS.count("gemini_retries")
+    STATS.observe("retry_wait_s", delay)
+    time.sleep(delay)
+
+
+def report_date(report_path: Path) -> str:
+    """YYYY-MM-DD from a cursor-report-*.md or cursor-sessions-*.jsonl name, else "today"."""
+    for prefix in ("cursor-report-", "cursor-sessions-"):
+        if prefix in report_path.name:
+            return report_path.stem.replace(prefix, "")
+    return "today"
+
+
+def summarize_file(
+    report_path: Path,
+    out_path: Path,
+    api_key: str,
+    model: str | None = None,
+    map_reduce: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    reduce: str = "gemini",
+    use_cache: bool = True,
+    stream: bool = False,
+    max_prompt_tokens: int = PROMPT_MAX_TOKENS,
+) -> str:
+    """
+    Summarize one raw report file, or a session export (.jsonl), with summarize_report;
+    returns the summary.
+    """
+    with STATS.stage("load"):
+        if report_path.suffix == ".jsonl":
+            date_gregorian, report_content = load_sessions_report(report_path)
+        else:
+            date_gregorian, report_content = report_date(report_path), load_report(report_path)
+    return summarize_report(
+        report_content, date_gregorian, out_path, api_key, model=model,
+        map_reduce=map_reduce, workers=workers, reduce=reduce, use_cache=use_cache,
+        stream=stream, max_prompt_tokens=max_prompt_tokens,
+    )
+
+
+def summarize_report(
+    report_content: str,
+    date_gregorian: str,
+    out_path: Path,
+    api_key: str,
+    model: str | None = None,
+    map_reduce: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    reduce: str = "gemini",
+    use_cache: bool = True,
+    stream: bool = False,
+    max_prompt_tokens: int = PROMPT_MAX_TOKENS,
+) -> str:
+    """
+    Summarize a raw report and write the summary to out_path; returns the summary.
+    With stream, the summary is printed as it arrives and written to out_path + ".part",
+    which replaces out_path only once the response is complete. The single prompt is cut
+    down to max_prompt_tokens (see build_prompt; 0 = no limit).
+    """
+    with STATS.stage("prompt"):
+        prompt = build_prompt(report_content, date_gregorian, max_prompt_tokens)
+    if not map_reduce and not prompt.endswith(report_content + "\n"):
+        print(f"  Report trimmed to about {max_prompt_tokens} tokens (--max-prompt-tokens); "
+              "oldest chats left out first.")
+    STATS.set("report_chars", len(report_content))
+    STATS.set("prompt_chars", len(prompt))
+    STATS.set("prompt_bytes", len(prompt.encode("utf-8")))
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = out_path.with_name(out_path.name + ".part")
+    try:
+        with STATS.stage("gemini"), open(part_path, "w", encoding="utf-8") as part:
+            on_chunk = None
+            if stream:
+                def on_chunk(piece: str) -> None:
+                    sys.stdout.write(piece)
+                    sys.stdout.flush()
+                    part.write(piece)
+                    part.flush()
+
+            if map_reduce:
+                summary = summarize_map_reduce(
+                    api_key, report_content, date_gregorian, model=model,
+                    workers=workers, reduce=reduce, use_cache=use_cache, on_chunk=on_chunk,
+                    max_prompt_tokens=max_prompt_tokens,
+                )
+            else:
+                summary = call_gemini(
+                    api_key, prompt, model=model, use_cache=use_cache, on_chunk=on_chunk
+                )
+            if stream:
+                print()
+
+        with STATS.stage("write"):
+            # The streamed pieces are not stripped; write the final text and swap it in.
+            part_path.write_text(summary, encoding="utf-8")
+            os.replace(part_path, out_path)
+    finally:
+        part_path.unlink(missing_ok=True)
+    return summary
+
+
+def backfill(report_paths: list[Path], reports_dir: Path, args: argparse.Namespace) -> int:
+    """
+    Summarize many reports as queued jobs (paced by RATE_LIMITER). Days finished in an earlier,
+    interrupted run with the same report content and settings are skipped. Returns the number
+    of failed days.
+    """
+    progress = None if args.no_cache else Progress(PROGRESS_PATH)
+    settings = json.dumps(
+        [args.model, args.map_reduce, args.reduce, args.max_prompt_tokens, GENERATION_CONFIG]
+    )
+    jobs = []
+    for report_path in report_paths:
+        out_path = reports_dir / f"summary-report-{report_date(report_path)}.md"
+        content = report_path.read_bytes()
+        fingerprint = hashlib.sha256(settings.encode("utf-8") + content).hexdigest()
+
+        def job(report_path: Path = report_path, out_path: Path = out_path) -> Path:
+            summarize_file(
+                report_path, out_path, args.api_key, model=args.model,
+                map_reduce=args.map_reduce, workers=args.workers, reduce=args.reduce,
+                use_cache=not args.no_cache, max_prompt_tokens=args.max_prompt_tokens,
+            )
+            print(f"Summary saved: {out_path}")
+            return out_path
+
+        jobs.append((str(report_path), fingerprint, job))
+
+    # With --map-reduce the workers are used inside each day; otherwise days run side by side.
+    skipped, failed = run_jobs(jobs, progress, workers=1 if args.map_reduce else args.workers)
+    for key in skipped:
+        print(f"Already summarized: {key}")
+    for key, error in failed:
+        print(f"Failed: {key}: {error}", file=sys.stderr)
+    print(f"{len(jobs) - len(skipped) - len(failed)} summarized, {len(skipped)} skipped, "
+          f"{len(failed)} failed.")
+    return len(failed)
+
+
 def main() -> None:
     script_dir = Path(__file__).resolve().parent
     load_dotenv(script_dir / ".env")
@@ -125,10 +722,9 @@ def main() -> None:
         description="Send Cursor raw report to Gemini and save short work summary."
     )
     parser.add_argument(
-        "report_file",
-        nargs="?",
-        default=None,
-        help="Path to raw report. Default: today's report.",
+        "report_files",
+        nargs="*",
+        help="Path(s) to raw reports. Default: today's report. Several paths run as a backfill.",
     )
     parser.add_argument(
         "--api-key",
@@ -145,22 +741,111 @@ def main() -> None:
         default=os.environ.get("GEMINI_MODEL") or DEFAULT_MODEL,
         help=f"Gemini model (default: {DEFAULT_MODEL}).",
     )
+    parser.add_argument(
+        "--map-reduce",
+        action="store_true",
+        help="Summarize each project in its own request, concurrently, then merge the results.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent Gemini requests: projects with --map-reduce, else days of a backfill "
+        f"(default: {DEFAULT_WORKERS}).",
+    )
+    parser.add_argument(
+        "--reduce",
+        choices=("gemini", "local"),
+        default="gemini",
+        help="Merge project summaries with one more Gemini call (default) or a local template.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call Gemini instead of reusing cached responses (.cache/gemini/).",
+    )
+    parser.add_argument(
+        "--from",
+        dest="date_from",
+        default=None,
+        help="First day YYYY-MM-DD; with --to, summarizes reports/cursor-report-*.md in the range.",
+    )
+    parser.add_argument(
+        "--to",
+        dest="date_to",
+        default=None,
+        help="Last day YYYY-MM-DD (inclusive).",
+    )
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        default=float(os.environ.get("GEMINI_RPM") or 0),
+        help="Max Gemini requests per minute (default: GEMINI_RPM, 0 = no limit).",
+    )
+    parser.add_argument(
+        "--tpm",
+        type=float,
+        default=float(os.environ.get("GEMINI_TPM") or 0),
+        help="Max prompt tokens per minute, estimated from prompt length "
+        "(default: GEMINI_TPM, 0 = no limit).",
+    )
+    parser.add_argument(
+        "--max-prompt-tokens",
+        type=int,
+        default=int(os.environ.get("GEMINI_MAX_PROMPT_TOKENS") or PROMPT_MAX_TOKENS),
+        help="Cut the report down to about this many prompt tokens, keeping every project and "
+        f"the newest chats (default: GEMINI_MAX_PROMPT_TOKENS or {PROMPT_MAX_TOKENS}; "
+        "0 = no limit).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the summary while Gemini writes it (streamGenerateContent); with "
+        "--map-reduce, the final merge is streamed.",
+    )
+    add_stats_argument(parser)
     args = parser.parse_args()
+    STATS.enabled = args.stats is not None
+
+    global RATE_LIMITER
+    if args.rpm > 0 or args.tpm > 0:
+        RATE_LIMITER = RateLimiter(args.rpm, args.tpm)
 
     reports_dir = script_dir / "reports"
 
-    if args.report_file:
-        report_path = Path(args.report_file)
+    report_paths = []
+    for report_file in args.report_files:
+        report_path = Path(report_file)
         if not report_path.is_absolute():
             report_path = (script_dir / report_path).resolve()
-    else:
+        report_paths.append(report_path)
+    if args.date_from or args.date_to:
+        from datetime import datetime, timedelta
+        try:
+            day = datetime.strptime(args.date_from or "", "%Y-%m-%d")
+            last = datetime.strptime(args.date_to or "", "%Y-%m-%d")
+        except ValueError:
+            print("Invalid --from/--to; use both, as YYYY-MM-DD.", file=sys.stderr)
+            sys.exit(1)
+        while day <= last:
+            report_path = reports_dir / f"cursor-report-{day.strftime('%Y-%m-%d')}.md"
+            if report_path.exists():
+                report_paths.append(report_path)
+            else:
+                print(f"No report for {day.strftime('%Y-%m-%d')}, skipping.")
+            day += timedelta(days=1)
+        if not report_paths:
+            print("No reports found in the range.", file=sys.stderr)
+            sys.exit(1)
+    if not report_paths:
         from datetime import datetime
         today = datetime.now().strftime("%Y-%m-%d")
-        report_path = reports_dir / f"cursor-report-{today}.md"
+        report_paths.append(reports_dir / f"cursor-report-{today}.md")
 
-    if not report_path.exists():
-        print(f"Report file not found: {report_path}", file=sys.stderr)
-        sys.exit(1)
+    for report_path in report_paths:
+        if not report_path.exists():
+            print(f"Report file not found: {report_path}", file=sys.stderr)
+            sys.exit(1)
 
     if not args.api_key:
         print(
@@ -169,30 +854,45 @@ def main() -> None:
         )
         sys.exit(1)
 
-    date_gregorian = (
-        report_path.stem.replace("cursor-report-", "")
-        if "cursor-report-" in report_path.name
-        else "today"
-    )
-    report_content = load_report(report_path)
-    prompt = build_prompt(report_content, date_gregorian)
-
-    print("Sending to Gemini...")
-    summary = call_gemini(args.api_key, prompt, model=args.model)
+    if len(report_paths) > 1:
+        if args.output or args.stream:
+            print("--output and --stream work with a single report only.", file=sys.stderr)
+            sys.exit(1)
+        failed = backfill(report_paths, reports_dir, args)
+        if not args.no_cache:
+            evict_gemini_cache()
+        write_stats(args.stats)
+        if failed:
+            sys.exit(1)
+        return
 
+    report_path = report_paths[0]
     if args.output:
         out_path = Path(args.output)
     else:
-        out_path = reports_dir / f"summary-report-{date_gregorian}.md"
+        out_path = reports_dir / f"summary-report-{report_date(report_path)}.md"
     if not out_path.is_absolute():
         out_path = (script_dir / out_path).resolve()
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(summary, encoding="utf-8")
+    print("Sending to Gemini...")
+    try:
+        summary = summarize_file(
+            report_path, out_path, args.api_key, model=args.model,
+            map_reduce=args.map_reduce, workers=args.workers, reduce=args.reduce,
+            use_cache=not args.no_cache, stream=args.stream,
+            max_prompt_tokens=args.max_prompt_tokens,
+        )
+    except SystemExit:
+        write_stats(args.stats)
+        raise
+    if not args.no_cache:
+        evict_gemini_cache()
     print(f"Summary saved: {out_path}")
-    print("")
-    print("---")
-    print(summary[:800] + ("..." if len(summary) > 800 else ""))
+    if not args.stream:
+        print("")
+        print("---")
+        print(summary[:800] + ("..." if len(summary) > 800 else ""))
+    write_stats(args.stats)
 
 
 if __name__ == "__main__":
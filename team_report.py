@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Team report: one raw report for the Cursor data of many developers (exported ~/.cursor trees),
+grouped by developer and then by project.
+
+A root is a folder with a projects/ tree (agent-transcripts, as in ~/.cursor) and optionally
+a workspaceStorage/ folder (a copy of Cursor's User/workspaceStorage, for real project paths);
+a folder that holds the project folders directly works too. Roots come from --roots globs
+and/or a --manifest file. Each developer is scanned and rendered in its own worker process,
+--jobs at a time, so one slow or very large developer does not hold up the others (a
+developer's own roots are scanned one after another, as they share a section). Sections are
+written to temporary files and joined in developer order, so memory does not grow with the
+size of the team.
+
+Usage:
+  python3 team_report.py --roots '/data/exports/*/.cursor' --date 2026-01-30
+  python3 team_report.py --manifest team.txt --jobs 8 --output team-2026-01-30.md
+
+Manifest: one root per line, optionally as "developer = path" (relative paths are relative to
+the manifest); lines starting with "#" are ignored. Without a name, the developer is the root's
+folder name, or its parent's for a folder such as .cursor. Roots with the same developer name
+are reported together.
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import TextIO
+
+import cursor_daily_report as cdr
+from report_stats import CHARS_PER_TOKEN, STATS, add_stats_argument, write_stats
+
+
+def developer_name(root: Path) -> str:
+    """Name for a root without one in the manifest (alice/.cursor -> alice)."""
+    root = Path(os.path.abspath(root))
+    return root.parent.name if root.name.startswith(".") else root.name
+
+
+def read_manifest(path: Path) -> list[tuple[str, Path]]:
+    """(developer, root) for every root listed in a manifest file."""
+    roots = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        name, sep, rest = line.partition("=")
+        if sep and "/" not in name and "\\" not in name:
+            root = path.parent / Path(rest.strip()).expanduser()
+            roots.append((name.strip(), root))
+        else:
+            root = path.parent / Path(line).expanduser()
+            roots.append((developer_name(root), root))
+    return roots
+
+
+def find_roots(patterns: list[str], manifest: Path | None = None) -> dict[str, list[Path]]:
+    """Developer -> roots, from glob patterns (folders only) and a manifest file."""
+    found = [
+        (developer_name(Path(match)), Path(match))
+        for pattern in patterns
+        for match in sorted(glob.glob(os.path.expanduser(pattern)))
+        if os.path.isdir(match)
+    ]
+    if manifest is not None:
+        found += read_manifest(manifest)
+    developers: dict[str, list[Path]] = {}
+    for name, root in found:
+        root = Path(os.path.abspath(root))
+        roots = developers.setdefault(name, [])
+        if root not in roots:
+            roots.append(root)
+    return developers
+
+
+def _root_paths(root: Path) -> tuple[Path, Path]:
+    """(projects folder, workspaceStorage folder) of a root."""
+    projects = root / "projects" if (root / "projects").is_dir() else root
+    for ws in (root / "workspaceStorage", root / "User" / "workspaceStorage"):
+        if ws.is_dir():
+            return projects, ws
+    return projects, root / "workspaceStorage"
+
+
+def _developer_section(
+    name: str,
+    roots: list[Path],
+    out_path: str,
+    report_date: datetime,
+    start_hour: int,
+    end_hour: int,
+    max_first_message_chars: int,
+    compact: bool,
+    dedupe: bool,
+    use_cache: bool,
+) -> tuple[int, int, int, int]:
+    """
+    Write the "## developer" section for roots to out_path; the roots are scanned one after
+    another. Returns (chats, projects, requests collapsed by dedupe, their characters).
+    """
+    rows = []
+    for root in roots:
+        projects_root, workspace_storage = _root_paths(root)
+        # Each root keeps its own workspace index and scan manifest.
+        key = hashlib.sha1(os.path.abspath(root).encode("utf-8")).hexdigest()[:16]
+        # Streaming keeps large transcripts out of memory (read again only with --full).
+        rows += cdr.collect_transcripts(
+            report_date, start_hour, end_hour, use_cache=use_cache, streaming=True,
+            projects_root=projects_root, workspace_storage=workspace_storage,
+            cache_dir=cdr.CACHE_DIR / "team" / key,
+        )
+
+    with STATS.stage("render"):
+        projects, collapsed, collapsed_chars = cdr._plan_projects(
+            rows, max_first_message_chars, dedupe
+        )
+    with open(out_path, "w", encoding="utf-8") as section:
+        section.write(f"## {name}\n\n")
+        chunks = cdr._project_chunks(projects, compact, level=3)
+        for chunk in STATS.iter_stage("render", chunks):
+            section.write("".join(line + "\n" for line in chunk))
+        if not rows:
+            section.write("*No Cursor agent transcripts in the selected time window.*\n\n\n")
+    return len(rows), len(projects), collapsed, collapsed_chars
+
+
+def _developer_section_in_worker(
+    stats_enabled: bool, *args
+) -> tuple[tuple[int, int, int, int], float, dict | None]:
+    """_developer_section in a pool process, with its wall time and STATS for the parent."""
+    STATS.enabled = stats_enabled
+    STATS.reset()
+    t0 = time.perf_counter()
+    result = _developer_section(*args)
+    return result, time.perf_counter() - t0, STATS.drain()
+
+
+def write_team_report(
+    out: TextIO,
+    developers: dict[str, list[Path]],
+    report_date: datetime,
+    start_hour: int = 3,
+    end_hour: int = 1,
+    max_first_message_chars: int = 500,
+    compact: bool = True,
+    dedupe: bool = False,
+    use_cache: bool = True,
+    jobs: int = 1,
+) -> int:
+    """
+    Write the team report for developers (name -> roots) to out; developers are scanned in a
+    process pool if jobs > 1. Returns the number of chats.
+    """
+    names = sorted(developers, key=str.lower)
+    results: dict[str, tuple[int, int, int, int]] = {}
+    with tempfile.TemporaryDirectory(prefix="team-report-") as tmp_dir:
+        paths = {name: os.path.join(tmp_dir, f"{i}.md") for i, name in enumerate(names)}
+        options = (
+            report_date, start_hour, end_hour, max_first_message_chars, compact, dedupe,
+            use_cache,
+        )
+
+        def done(name: str, result: tuple[int, int, int, int], seconds: float) -> None:
+            results[name] = result
+            STATS.observe("developer_s", seconds)
+            print(f"  {name}: {result[0]} chats ({seconds:.1f} s)", file=sys.stderr)
+
+        if jobs <= 1 or len(names) <= 1:
+            for name in names:
+                t0 = time.perf_counter()
+                result = _developer_section(name, developers[name], paths[name], *options)
+                done(name, result, time.perf_counter() - t0)
+        else:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+
+            with ProcessPoolExecutor(max_workers=min(jobs, len(names))) as pool:
+                futures = {
+                    pool.submit(
+                        _developer_section_in_worker, STATS.enabled, name, developers[name],
+                        paths[name], *options,
+                    ): name
+                    for name in names
+                }
+                for future in as_completed(futures):
+                    result, seconds, worker_stats = future.result()
+                    STATS.merge(worker_stats)
+                    done(futures[future], result, seconds)
+
+        chats = sum(r[0] for r in results.values())
+        projects = sum(r[1] for r in results.values())
+        collapsed = sum(r[2] for r in results.values())
+        collapsed_chars = sum(r[3] for r in results.values())
+        active = sum(1 for r in results.values() if r[0])
+        day_str = report_date.strftime("%Y-%m-%d")
+        out.write(f"# Cursor Team Work Report — {day_str}\n\n")
+        out.write(f"Time window: **{start_hour}:00 – next day {end_hour}:00** "
+                  "(based on file last-modified time).\n\n")
+        out.write(f"Developers: **{active}** of {len(names)} with chats; {chats} chats in "
+                  f"{projects} projects.\n\n")
+        if collapsed:
+            out.write(f"Repeated requests collapsed: **{collapsed}** ({collapsed_chars} "
+                      f"characters, ~{collapsed_chars // CHARS_PER_TOKEN} tokens saved).\n\n")
+        out.write("---\n\n")
+        with STATS.stage("join"):
+            for name in names:
+                with open(paths[name], encoding="utf-8") as section:
+                    shutil.copyfileobj(section, out)
+    STATS.set("developers", len(names))
+    return chats
+
+
+def main() -> None:
+    script_dir = Path(__file__).resolve().parent
+    ap = argparse.ArgumentParser(
+        description="One raw report for many developers' Cursor transcripts, by developer "
+        "and project."
+    )
+    ap.add_argument(
+        "--roots",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Exported .cursor folders (glob; repeatable), e.g. '/data/exports/*/.cursor'.",
+    )
+    ap.add_argument(
+        "--manifest",
+        default=None,
+        help='File with one root per line, optionally "developer = path".',
+    )
+    ap.add_argument("--date", default=None, help="Report date YYYY-MM-DD (default: today).")
+    ap.add_argument("--start", type=int, default=3, help="Start hour of work day (default 3).")
+    ap.add_argument("--end", type=int, default=1, help="End hour, next day (default 1).")
+    ap.add_argument(
+        "--output",
+        default=None,
+        help="Write the report to this file (default: "
+        "reports/team-report-YYYY-MM-DD.md; '-' = stdout).",
+    )
+    ap.add_argument(
+        "--max-chars", type=int, default=500, help="Max characters per request (default 500)."
+    )
+    ap.add_argument("--full", action="store_true", help="Include full chat text.")
+    ap.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="List requests repeated within a developer's project once, with a count.",
+    )
+    ap.add_argument(
+        "--no-cache", action="store_true", help="Re-parse every transcript (no .cache/)."
+    )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Developers scanned at the same time, each in its own process "
+        "(default 0 = one per CPU).",
+    )
+    add_stats_argument(ap)
+    args = ap.parse_args()
+    STATS.enabled = args.stats is not None
+
+    try:
+        report_date = (
+            datetime.strptime(args.date, "%Y-%m-%d") if args.date
+            else datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        )
+    except ValueError:
+        print("Invalid --date; use YYYY-MM-DD.")
+        return
+    try:
+        developers = find_roots(args.roots, Path(args.manifest) if args.manifest else None)
+    except OSError as e:
+        print(f"Could not read {args.manifest}: {e}")
+        return
+    if not developers:
+        print("No roots found; pass --roots GLOB and/or --manifest FILE.")
+        return
+
+    options = dict(
+        start_hour=args.start,
+        end_hour=args.end,
+        max_first_message_chars=args.max_chars,
+        compact=not args.full,
+        dedupe=args.dedupe,
+        use_cache=not args.no_cache,
+        jobs=args.jobs or os.cpu_count() or 1,
+    )
+    roots = sum(len(r) for r in developers.values())
+    print(f"{len(developers)} developers, {roots} roots.", file=sys.stderr)
+    if args.output == "-":
+        write_team_report(sys.stdout, developers, report_date, **options)
+    else:
+        day_str = report_date.strftime("%Y-%m-%d")
+        out_path = (
+            Path(args.output) if args.output
+            else script_dir / "reports" / f"team-report-{day_str}.md"
+        )
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = out_path.with_name(out_path.name + ".part")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as out:
+                write_team_report(out, developers, report_date, **options)
+            os.replace(tmp_path, out_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        print(f"Report written to: {out_path}")
+    write_stats(args.stats)
+
+
+if __name__ == "__main__":
+    main()
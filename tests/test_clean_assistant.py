@@ -0,0 +1,105 @@
+import random
+import re
+
+import cursor_daily_report as cdr
+
+
+def _reference_remove_fenced_blocks(text: str) -> str:
+    out = text
+    while True:  # the old version stopped after 100 fences
+        m = re.search(r"(`{3,})\w*\n.*?\n\1", out, re.DOTALL)
+        if not m:
+            break
+        out = out[: m.start()] + cdr._CODE_OMITTED + out[m.end() :]
+    return out
+
+
+def _reference_shorten_tool_call_body(text: str) -> str:
+    lines = text.split("\n")
+    result: list[str] = []
+    i = 0
+
+    def is_key_line(ln: str) -> bool:
+        s = ln.strip()
+        return (s.startswith("path:") or s.startswith("contents:") or
+                s.startswith("old_string:") or s.startswith("new_string:"))
+
+    while i < len(lines):
+        line = lines[i]
+        if is_key_line(line) and "contents:" in line:
+            result.append(line.split("contents:")[0].rstrip() + " contents: " + cdr._CODE_OMITTED)
+            i += 1
+            while i < len(lines):
+                if lines[i].startswith("[Tool") or is_key_line(lines[i]):
+                    break
+                i += 1
+            continue
+        if is_key_line(line) and "old_string:" in line:
+            result.append(line.split("old_string:")[0].rstrip() + " old_string: " + cdr._CODE_OMITTED)
+            i += 1
+            while i < len(lines):
+                if lines[i].strip().startswith("new_string:") or lines[i].startswith("[Tool"):
+                    break
+                i += 1
+            continue
+        if is_key_line(line) and "new_string:" in line:
+            result.append(line.split("new_string:")[0].rstrip() + " new_string: " + cdr._CODE_OMITTED)
+            i += 1
+            while i < len(lines):
+                if lines[i].startswith("[Tool") or (is_key_line(lines[i]) and "old_string:" in lines[i]):
+                    break
+                i += 1
+            continue
+        result.append(line)
+        i += 1
+    return "\n".join(result)
+
+
+def _reference_clean(raw: str) -> str:
+    """The regex _clean_assistant_content that the linear-time version replaced."""
+    out = raw
+    while True:
+        m = re.search(r"<think>\s*.*?\s*</think>", out, re.DOTALL | re.IGNORECASE)
+        if not m:
+            break
+        out = out[: m.start()].rstrip() + "\n\n" + out[m.end() :].lstrip()
+    out = _reference_remove_fenced_blocks(out)
+    out = _reference_shorten_tool_call_body(out)
+    return re.sub(r"\n{3,}", "\n\n", out).strip()
+
+
+_PIECES = [
+    "```", "````", "```python", "``` ", "`", "\n", "\n\n", "\n\n\n", " ", "  \n", "text",
+    "<think>", "</think>", "<THINK>", " </Think>\n", "x = 1", "[Tool call] Write",
+    "[Tool result] Write", "  path: /a.py", "  contents: import os", "  old_string: a",
+    "  new_string: b", "contents:", "é",
+]
+
+
+def _random_content(rng: random.Random) -> str:
+    return "".join(rng.choice(_PIECES) for _ in range(rng.randint(0, 60)))
+
+
+def test_matches_the_regex_cleaner_on_fuzzed_content():
+    rng = random.Random(6)
+    for _ in range(5000):
+        raw = _random_content(rng)
+        assert cdr._clean_assistant_content(raw) == _reference_clean(raw), raw
+
+
+def test_matches_the_regex_cleaner_on_realistic_content():
+    import bench_corpus
+
+    rng = random.Random(7)
+    for _ in range(50):
+        text = bench_corpus.transcript(rng, 3, code_lines=3)
+        for role, content in cdr.parse_transcript_full(text):
+            if role == "assistant":
+                assert cdr._clean_assistant_content(content) == _reference_clean(content)
+
+
+def test_more_than_100_fences_are_all_collapsed():
+    raw = "intro\n" + "```python\nx = 1\n```\nok\n" * 300
+    cleaned = cdr._clean_assistant_content(raw)
+    assert cleaned == _reference_clean(raw)
+    assert cleaned.count(cdr._CODE_OMITTED) == 300
@@ -0,0 +1,41 @@
+import sys
+
+import cursor_daily_report as cdr
+import daily_pipeline
+import summary_report
+
+
+def _run(monkeypatch, tmp_path, *argv):
+    calls = {}
+
+    def build_report(report_date, **options):
+        calls["build"] = options
+        return "# report\n"
+
+    def summarize_report(report, day_str, out_path, api_key, **options):
+        calls["summarize"] = options
+
+    monkeypatch.setattr(cdr, "build_report", build_report)
+    monkeypatch.setattr(summary_report, "summarize_report", summarize_report)
+    monkeypatch.setattr(summary_report, "load_dotenv", lambda path: None)
+    monkeypatch.setattr(sys, "argv", [
+        "daily_pipeline.py", "2026-01-30", "--api-key", "k", "--no-cache",
+        "--reports-dir", str(tmp_path), *argv,
+    ])
+    daily_pipeline.main()
+    return calls
+
+
+def test_dedupe_is_opt_in(monkeypatch, tmp_path):
+    assert _run(monkeypatch, tmp_path)["build"]["dedupe"] is False
+    assert _run(monkeypatch, tmp_path, "--dedupe")["build"]["dedupe"] is True
+
+
+def test_max_prompt_tokens_from_env_or_flag(monkeypatch, tmp_path):
+    monkeypatch.delenv("GEMINI_MAX_PROMPT_TOKENS", raising=False)
+    calls = _run(monkeypatch, tmp_path)
+    assert calls["summarize"]["max_prompt_tokens"] == summary_report.PROMPT_MAX_TOKENS
+    monkeypatch.setenv("GEMINI_MAX_PROMPT_TOKENS", "1234")
+    assert _run(monkeypatch, tmp_path)["summarize"]["max_prompt_tokens"] == 1234
+    calls = _run(monkeypatch, tmp_path, "--max-prompt-tokens", "0")
+    assert calls["summarize"]["max_prompt_tokens"] == 0
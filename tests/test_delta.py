@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+
+import cursor_daily_report as cdr
+
+
+def _row(turns: list[tuple[str, str]]):
+    messages = [text for role, text in turns if role == "user"]
+    return ("home-me-app", "/home/me/app", datetime(2026, 1, 30, 10), messages, turns, "s1")
+
+
+def test_delta_rows_leaves_out_turns_of_earlier_reports():
+    snapshots: dict = {}
+    first = [("user", "a"), ("assistant", "b")]
+    cdr.delta_rows([_row(first)], datetime(2026, 1, 29), snapshots)
+    rows, continued = cdr.delta_rows(
+        [_row(first + [("user", "c")])], datetime(2026, 1, 30), snapshots
+    )
+    assert rows[0][4] == [("user", "c")]
+    assert continued == {"s1": 2}
+    unchanged = [_row(first + [("user", "c")])]
+    assert cdr.delta_rows(unchanged, datetime(2026, 1, 31), snapshots)[0] == []
+
+
+def test_prune_snapshots_keeps_the_latest_entry_before_the_period():
+    day = lambda n: (datetime.now() - timedelta(days=n)).strftime("%Y-%m-%d")
+    snapshots = {
+        "active": [[day(50), 1, "h1"], [day(40), 2, "h2"], [day(35), 3, "h3"], [day(2), 4, "h4"]],
+        "idle": [[day(60), 1, "h1"], [day(45), 2, "h2"]],
+        "recent": [[day(3), 1, "h1"]],
+    }
+    assert cdr.prune_snapshots(snapshots, max_age_days=30) == 4
+    assert snapshots == {
+        "active": [[day(35), 3, "h3"], [day(2), 4, "h4"]],
+        "recent": [[day(3), 1, "h1"]],
+    }
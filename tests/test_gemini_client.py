@@ -0,0 +1,73 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gemini_client import GZIP_MIN_BYTES, GeminiClient, GeminiHTTPError
+
+_OK = {"candidates": [{"content": {"parts": [{"text": "done"}]}, "finishReason": "STOP"}]}
+
+
+def _server(reply):
+    """Local server; reply(gzipped) -> (status, body). Returns (base URL, request log, server)."""
+    log = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            gzipped = self.headers.get("Content-Encoding") == "gzip"
+            log.append(gzipped)
+            status, body = reply(gzipped)
+            if status == 200 and "alt=sse" in self.path:
+                body = b"data: " + json.dumps(_OK).encode() + b"\r\n\r\n"
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/v1beta/models", log, server
+
+
+def _call(client, streaming):
+    prompt = "x" * (GZIP_MIN_BYTES * 2)
+    if streaming:
+        return "".join(client.stream_generate("key", "m", prompt, {}))
+    return client.generate("key", "m", prompt, {})
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_real_400_is_not_resent_and_keeps_gzip(streaming):
+    base, log, server = _server(lambda gzipped: (400, b'{"error": {"message": "API key not valid"}}'))
+    try:
+        client = GeminiClient(base)
+        with pytest.raises(GeminiHTTPError) as e:
+            _call(client, streaming)
+        assert e.value.code == 400
+        assert log == [True]
+        assert client.gzip_requests
+    finally:
+        server.shutdown()
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("status, message", [
+    (415, b"Unsupported Media Type"),
+    (400, b'{"error": {"message": "Content-Encoding gzip is not supported"}}'),
+])
+def test_gzip_rejection_falls_back_to_plain_json(streaming, status, message):
+    base, log, server = _server(
+        lambda gzipped: (status, message) if gzipped else (200, json.dumps(_OK).encode())
+    )
+    try:
+        client = GeminiClient(base)
+        assert _call(client, streaming) == "done"
+        assert log == [True, False]
+        assert not client.gzip_requests
+    finally:
+        server.shutdown()
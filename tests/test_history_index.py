@@ -0,0 +1,44 @@
+import sys
+
+import pytest
+
+import history_index
+
+
+def _index(tmp_path, projects):
+    conn = history_index.open_index(tmp_path / "history.sqlite3")
+    for i, (slug, path) in enumerate(projects):
+        session = conn.execute(
+            "INSERT INTO sessions (slug, project_path, session_id, size, mtime_ns, mtime, turns,"
+            " transcript) VALUES (?, ?, ?, 0, 0, '2026-01-30T10:00:00', 1, ?)",
+            (slug, path, f"s{i}", f"/t/{i}.txt"),
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO turns (session, n, role, text) VALUES (?, 1, 'user', 'fix the migration')",
+            (session,),
+        )
+    conn.commit()
+    return conn
+
+
+def test_project_filter_matches_underscore_and_percent_literally(tmp_path):
+    conn = _index(tmp_path, [("home-me-my_app", "/home/me/my_app"),
+                             ("home-me-myxapp", "/home/me/myxapp"),
+                             ("home-me-100%", "/home/me/100%")])
+    assert [r[3] for r in history_index.search(conn, "migration", project="my_app")] == ["s0"]
+    assert [r[3] for r in history_index.search(conn, "migration", project="0%")] == ["s2"]
+
+
+def test_blank_and_invalid_queries_raise_value_error(tmp_path):
+    conn = _index(tmp_path, [("home-me-app", "/home/me/app")])
+    for query in ("", "   "):
+        with pytest.raises(ValueError):
+            history_index.search(conn, query)
+    assert [r[3] for r in history_index.search(conn, '"fix the')] == ["s0"]
+
+
+def test_main_rejects_a_blank_query(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["history_index.py", " ", "--index",
+                                      str(tmp_path / "h.sqlite3")])
+    history_index.main()
+    assert "Empty query" in capsys.readouterr().out
@@ -0,0 +1,47 @@
+from message_dedupe import group_duplicates, shingles
+
+
+def _traceback(offset: int, frames: int = 5) -> str:
+    lines = ["Traceback (most recent call last):"]
+    for i in range(frames):
+        lines.append(f'  File "/app/module{i}.py", line {10 * i + offset}, in handler{i}')
+        lines.append(f"    result = step{i}(payload)")
+    lines.append("ValueError: invalid payload")
+    return "\n".join(lines)
+
+
+def test_exact_repeats_ignore_case_and_spacing():
+    assert group_duplicates(["Fix the test", "fix  the\ntest", "other"]) == [0, 0, 2]
+
+
+def test_traceback_with_other_line_numbers_is_grouped():
+    assert group_duplicates([_traceback(0), _traceback(2)]) == [0, 0]
+
+
+def test_short_traceback_with_other_line_numbers_is_grouped():
+    assert group_duplicates([_traceback(0, frames=1), _traceback(7, frames=1)]) == [0, 0]
+
+
+def test_different_requests_stay_apart():
+    messages = ["fix the login test please", "fix the signup page styling"]
+    assert group_duplicates(messages) == [0, 1]
+
+
+def test_log_numbers_share_shingles():
+    assert shingles("error at line 12 here") == shingles("error at line 345 here")
+    assert shingles("failed in app/config.py:12 at 10:31:07") == shingles(
+        "failed in app/config.py:98 at 11:02:45"
+    )
+    assert shingles("object at 0x7f3a2c10 in commit 9fceb02d") == shingles(
+        "object at 0x7f3a9e44 in commit 4b825dc6"
+    )
+
+
+def test_requests_that_differ_in_numbers_stay_apart():
+    messages = [
+        "set timeout to 30 in config.py",
+        "set timeout to 60 in config.py",
+        "retry the upload 3 times before failing",
+        "retry the upload 5 times before failing",
+    ]
+    assert group_duplicates(messages) == [0, 1, 2, 3]
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+import cursor_daily_report as cdr
+
+
+def _rows(*chats):
+    rows = []
+    for n, messages in enumerate(chats):
+        turns = [("user", m) for m in messages]
+        rows.append(("home-me-app", "/home/me/app", datetime(2026, 1, 30, 10 + n), list(messages),
+                     turns, f"s{n}"))
+    return rows
+
+
+def _assert_no_setext_headings(report: str) -> None:
+    # A paragraph line right above "---" makes it a heading; a list item does not.
+    lines = report.split("\n")
+    for before, line in zip(lines, lines[1:]):
+        if line == "---" and not before[:1].isdigit():
+            assert before == "", f"{before!r} would become a heading"
+
+
+def test_dedupe_note_is_not_a_setext_heading():
+    rows = _rows(["fix the login test"], ["fix the login test", "add a logout button"])
+    for compact in (True, False):
+        report = cdr.build_report(datetime(2026, 1, 30), rows=rows, dedupe=True, compact=compact)
+        assert "_+1 repeated (counted above)_" in report
+        _assert_no_setext_headings(report)
+
+
+def test_dedupe_counts_repeats_under_first_chat():
+    rows = _rows(["fix the login test"], ["Fix the  login test"])
+    report = cdr.build_report(datetime(2026, 1, 30), rows=rows, dedupe=True)
+    assert "1. fix the login test (×2)" in report
+    assert "Repeated requests collapsed: **1**" in report
@@ -0,0 +1,43 @@
+import threading
+import time
+
+from report_stats import Stats
+
+
+def _enabled():
+    stats = Stats()
+    stats.enabled = True
+    return stats
+
+
+def test_render_stage_excludes_consumer_time():
+    stats = _enabled()
+    for _ in stats.iter_stage("render", range(3)):
+        time.sleep(0.05)  # the consumer writing the chunk
+    wall, _, calls = stats.stages["render"]
+    assert calls == 4  # three chunks and the end of the generator
+    assert wall < 0.05
+
+
+def test_merge_and_set_from_threads():
+    stats = _enabled()
+    worker = _enabled()
+    worker.count("requests", 2)
+    worker.file("/tmp/a.txt", 1.5, 100)
+    worker.samples["latency"] = [0.1]
+    state = worker.drain()
+
+    def run(n):
+        for i in range(200):
+            stats.merge(state)
+            stats.set(f"value{n}", i)
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert stats.counters["requests"] == 2 * 800
+    assert len(stats.samples["latency"]) == 800
+    assert stats.values == {f"value{n}": 199 for n in range(4)}
+    assert stats.slowest[0][2] == "/tmp/a.txt"
@@ -0,0 +1,39 @@
+import json
+from datetime import datetime
+
+import bench_corpus
+import cursor_daily_report as cdr
+
+
+def test_export_uses_the_collected_paths_and_offsets(tmp_path, monkeypatch):
+    monkeypatch.setattr(cdr, "PARSE_CACHE_DIR", tmp_path / "cache" / "transcripts")
+    day = datetime(2026, 1, 30)
+    root = tmp_path / "alice"
+    bench_corpus.generate_corpus(root, projects=2, sessions=3, turns=3, days=1, report_date=day)
+    collect = dict(projects_root=root / "projects", workspace_storage=root / "workspaceStorage",
+                   cache_dir=tmp_path / "cache" / "alice")
+    for _ in range(2):  # parsed, then from the parse cache
+        rows = cdr.collect_transcripts(day, **collect)
+        assert len(rows) == 6
+
+        def no_reread(*args, **kwargs):
+            raise AssertionError("transcript read again for the export")
+
+        monkeypatch.setattr(cdr, "iter_transcript_spans", no_reread)
+        out_path = tmp_path / "sessions.jsonl"
+        assert cdr.write_sessions_jsonl(out_path, rows, day, 3, 1) == 6
+        monkeypatch.undo()
+        monkeypatch.setattr(cdr, "PARSE_CACHE_DIR", tmp_path / "cache" / "transcripts")
+
+        for line in out_path.read_text(encoding="utf-8").splitlines():
+            record = json.loads(line)
+            transcript = root / "projects" / record["slug"] / "agent-transcripts"
+            assert record["transcript"] == str(transcript / f"{record['session_id']}.txt")
+            text = open(record["transcript"], encoding="utf-8").read()
+            for turn in record["turns"]:
+                assert text[turn["start"]:turn["end"]].strip() == turn["text"]
+
+    meta, read_back = cdr.read_sessions_jsonl(out_path)
+    assert meta == {"report_date": "2026-01-30", "start_hour": 3, "end_hour": 1}
+    assert [row[4] for row in read_back] == [row[4] for row in rows]
+    assert [str(row[4].txt_file) for row in read_back] == [str(row[4].txt_file) for row in rows]
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+import cursor_daily_report as cdr
+import summary_report as sr
+
+
+def _report(compact: bool) -> str:
+    readme = "write a README with:\n## Install\n## Usage\n### Chat 9 — 2026-01-30 09:00"
+    rows = [
+        ("home-me-alpha", "/home/me/alpha", datetime(2026, 1, 30, 10), [readme],
+         [("user", readme), ("assistant", "Done:\n## Install\n\n**Path:** `x`\n### Chat 1 — 2026-01-30 11:00")],
+         "a1"),
+        ("home-me-beta", "/home/me/beta", datetime(2026, 1, 30, 12), ["fix the tests"],
+         [("user", "fix the tests")], "b1"),
+    ]
+    return cdr.build_report(datetime(2026, 1, 30), rows=rows, compact=compact)
+
+
+def test_sections_are_the_rendered_projects():
+    for compact in (True, False):
+        header, sections = sr.split_report_sections(_report(compact))
+        assert header.startswith("# Cursor Daily Work Report")
+        assert [name for name, _ in sections] == ["alpha", "beta"]
+        for _, section in sections:
+            head, chats = sr.split_chats(section)
+            assert len(chats) == 1
+            assert sr.split_section(section, max_chars=10) == [head] + chats
+
+
+def test_fit_report_keeps_whole_chats():
+    report = _report(compact=False)
+    fitted, omitted, _, _ = sr.fit_report(report, max_tokens=sr.estimate_tokens(report) - 40)
+    _, sections = sr.split_report_sections(fitted)
+    assert [name for name, _ in sections] == ["alpha", "beta"]
+    assert omitted + sum(len(sr.split_chats(s)[1]) for _, s in sections) == 2
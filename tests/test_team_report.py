@@ -0,0 +1,29 @@
+import io
+from datetime import datetime
+
+import bench_corpus
+import cursor_daily_report as cdr
+import team_report
+
+
+def test_roots_are_passed_without_touching_module_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(cdr, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(cdr, "PARSE_CACHE_DIR", tmp_path / "cache" / "transcripts")
+    day = datetime(2026, 1, 30)
+    for seed, name in enumerate(["alice", "bob"], 1):
+        bench_corpus.generate_corpus(
+            tmp_path / name / ".cursor", projects=2, sessions=2, turns=2, days=1,
+            report_date=day, seed=seed,
+        )
+    before = (cdr.CURSOR_PROJECTS, cdr.CURSOR_WS_STORAGE, cdr.WORKSPACE_INDEX_PATH,
+              cdr.SCAN_MANIFEST_PATH)
+    developers = team_report.find_roots([str(tmp_path / "*" / ".cursor")])
+    out = io.StringIO()
+    chats = team_report.write_team_report(out, developers, day)
+    assert chats == 8
+    report = out.getvalue()
+    assert "## alice\n" in report and "## bob\n" in report
+    assert "### project 0\n\n**Path:** `/home/bench/project 0`" in report
+    assert (cdr.CURSOR_PROJECTS, cdr.CURSOR_WS_STORAGE, cdr.WORKSPACE_INDEX_PATH,
+            cdr.SCAN_MANIFEST_PATH) == before
+    assert len(list((tmp_path / "cache" / "team").glob("*/scan-manifest.json"))) == 2
@@ -0,0 +1,46 @@
+import os
+import random
+
+import cursor_daily_report as cdr
+from transcript_fuzz import random_transcript
+
+
+def _write(path, text: str, mtime: int) -> os.stat_result:
+    path.write_bytes(text.encode("utf-8"))
+    os.utime(path, (mtime, mtime))
+    return path.stat()
+
+
+def test_appended_transcript_parses_like_a_full_parse(tmp_path, monkeypatch):
+    monkeypatch.setattr(cdr, "PARSE_CACHE_DIR", tmp_path / "cache")
+    txt_file = tmp_path / "chat.txt"
+    rng = random.Random(2)
+    incremental = 0
+    for _ in range(300):
+        text = random_transcript(rng)
+        cut = rng.randint(0, len(text))
+        st = _write(txt_file, text[:cut], 1_000)
+        assert cdr.load_transcript_turns(txt_file, st) == cdr.parse_transcript_full(text[:cut])
+        st = _write(txt_file, text, 2_000)
+        entry = cdr._read_parse_cache(txt_file)
+        appended = cdr.parse_transcript_appended(txt_file, st, entry)
+        if appended is not None:
+            incremental += 1
+            assert appended[0] == cdr.parse_transcript_full(text), text
+        turns = cdr.load_transcript_turns(txt_file, st)
+        assert turns == cdr.parse_transcript_full(text), text
+        spans, _, _ = cdr.tokenize_transcript(text)
+        assert turns.offsets == [(start, end) for _, start, end in spans], text
+    assert incremental > 100
+
+
+def test_rewritten_transcript_is_parsed_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(cdr, "PARSE_CACHE_DIR", tmp_path / "cache")
+    txt_file = tmp_path / "chat.txt"
+    first = "user:\n<user_query>\nfirst\n</user_query>\nassistant:\nok\nuser:\n<user_query>\nx\n"
+    st = _write(txt_file, first, 1_000)
+    cdr.load_transcript_turns(txt_file, st)
+    second = first.replace("first", "other") + "</user_query>\nassistant:\ndone\n"
+    st = _write(txt_file, second, 2_000)
+    assert cdr.parse_transcript_appended(txt_file, st, cdr._read_parse_cache(txt_file)) is None
+    assert cdr.load_transcript_turns(txt_file, st) == cdr.parse_transcript_full(second)
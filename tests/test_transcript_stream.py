@@ -0,0 +1,27 @@
+import random
+
+import cursor_daily_report as cdr
+from transcript_fuzz import random_transcript
+
+
+def test_chunked_parse_matches_full_parse(tmp_path):
+    txt_file = tmp_path / "chat.txt"
+    rng = random.Random(3)
+    for _ in range(300):
+        text = random_transcript(rng)
+        txt_file.write_bytes(text.encode("utf-8"))
+        chunk_chars = rng.choice([1, 7, 64, 1000])
+        spans = list(cdr.iter_transcript_spans(txt_file, chunk_chars))
+        assert [(role, turn) for role, turn, _, _ in spans] == cdr.parse_transcript_full(text), text
+        for role, turn, start, end in spans:
+            assert text[start:end].strip().startswith(turn[:20])
+
+
+def test_streamed_turns_keep_user_messages_only(tmp_path):
+    txt_file = tmp_path / "chat.txt"
+    text = "user:\n<user_query>\nfix it\n</user_query>\nassistant:\ndone\n" * 50
+    txt_file.write_text(text, encoding="utf-8")
+    streamed = cdr.StreamedTurns(txt_file)
+    assert len(streamed) == 100
+    assert streamed.user_messages == ["fix it"] * 50
+    assert list(streamed) == cdr.parse_transcript_full(text)
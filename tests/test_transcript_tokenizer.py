@@ -0,0 +1,116 @@
+import random
+import re
+import time
+
+import cursor_daily_report as cdr
+from transcript_fuzz import random_transcript
+
+
+def _reference_parse_turns(content: str, pos: int = 0) -> list[tuple[str, str]]:
+    """The find/regex parser tokenize_transcript replaced, kept as the reference for its turns."""
+    turns: list[tuple[str, str]] = []
+    while pos < len(content):
+        at_start = pos == 0
+        find_user_line = content.find("user:\n", pos)
+        if at_start and content.startswith("user:\n"):
+            find_user_line = 0
+        find_query_tag = content.find("\n<user_query>", pos)
+        next_user_line = find_user_line if find_user_line != -1 else len(content)
+        next_query_tag = find_query_tag if find_query_tag != -1 else len(content)
+        if at_start and find_user_line == 0:
+            turn_start = 0
+            use_query_only = False
+        elif next_user_line <= next_query_tag:
+            if next_user_line >= len(content):
+                break
+            allowed = (next_user_line == 0 or
+                       "assistant:" in content[max(0, next_user_line - 30) : next_user_line])
+            if not allowed:
+                pos = next_user_line + 1
+                continue
+            turn_start = next_user_line + 1
+            use_query_only = False
+        else:
+            turn_start = next_query_tag + 2
+            use_query_only = True
+
+        if use_query_only:
+            q_open = turn_start - 1
+            q_content_start = cdr._next_line(content, q_open)
+            q_end = content.find("</user_query>", q_content_start)
+            next_asst = content.find("\nassistant:", q_content_start)
+            if q_end != -1:
+                user_content = content[q_content_start:q_end].strip()
+            else:
+                user_content = (content[q_content_start:next_asst].strip()
+                                if next_asst != -1 else content[q_content_start:].strip())
+            user_start_for_asst = q_open
+        else:
+            user_start = turn_start
+            q_open = content.find("<user_query>", user_start)
+            next_asst = content.find("\nassistant:", user_start)
+            if q_open != -1 and (next_asst == -1 or q_open < next_asst):
+                q_content_start = cdr._next_line(content, q_open)
+                q_end = content.find("</user_query>", q_content_start)
+                if q_end != -1:
+                    user_content = content[q_content_start:q_end].strip()
+                else:
+                    user_content = (content[q_content_start:next_asst].strip()
+                                    if next_asst != -1 else content[q_content_start:].strip())
+            else:
+                user_content_start = user_start + 6
+                user_content = (content[user_content_start:next_asst].strip()
+                                if next_asst != -1 else content[user_content_start:].strip())
+                if len(user_content) > 2000:
+                    user_content = user_content[:2000] + "\n… [truncated]"
+            user_start_for_asst = user_start
+
+        if user_content:
+            turns.append(("user", user_content))
+        asst_start = content.find("\nassistant:", user_start_for_asst)
+        if asst_start == -1:
+            break
+        asst_content_start = cdr._next_line(content, asst_start + 1)
+        next_user_line = content.find("\nuser:\n", asst_content_start)
+        next_query_tag = content.find("\n<user_query>", asst_content_start)
+        next_user = next_user_line if next_user_line != -1 else len(content)
+        if next_query_tag != -1 and next_query_tag < next_user:
+            next_user = next_query_tag
+        if next_user >= len(content):
+            asst_raw = content[asst_content_start:].strip()
+        else:
+            asst_raw = content[asst_content_start:next_user].strip()
+        think = re.search(r"<think>\s*.*?\s*</think>", asst_raw, re.DOTALL | re.IGNORECASE)
+        visible = asst_raw[think.end() :].strip() if think else asst_raw
+        if visible:
+            turns.append(("assistant", visible))
+        pos = asst_content_start if next_user >= len(content) else next_user
+    return turns
+
+
+def test_matches_reference_parser_on_fuzzed_transcripts():
+    rng = random.Random(4)
+    for _ in range(3000):
+        content = random_transcript(rng)
+        assert cdr.parse_transcript_full(content) == _reference_parse_turns(content), content
+        pos = rng.randint(0, len(content))
+        assert cdr._parse_turns(content, pos)[0] == _reference_parse_turns(content, pos), (content, pos)
+
+
+def test_spans_give_the_turn_text():
+    rng = random.Random(5)
+    for _ in range(500):
+        content = random_transcript(rng)
+        spans, _, _ = cdr.tokenize_transcript(content)
+        assert [cdr._span_text(content, span) for span in spans] == cdr.parse_transcript_full(content)
+
+
+def test_unclosed_tags_do_not_rescan_the_rest():
+    # Each unclosed <think> made the old parser search to the end again (quadratic).
+    content = "user:\n<user_query>\nq\n</user_query>\nassistant:\n" + "<think>\nhmm\n" * 1500
+    t0 = time.perf_counter()
+    expected = _reference_parse_turns(content)
+    reference_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    assert cdr.parse_transcript_full(content) == expected
+    assert time.perf_counter() - t0 < reference_s / 10
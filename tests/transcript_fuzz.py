@@ -0,0 +1,26 @@
+"""Random transcripts for the parser tests: realistic turns mixed with marker soup."""
+
+import random
+
+import bench_corpus
+
+_PIECES = [
+    "user:\n", "\nuser:\n", "user:", "\n<user_query>\n", "<user_query>", "</user_query>",
+    "\nassistant:\n", "\nassistant:", "assistant:", "<think>", "</think>", "<THINK>\n",
+    "<attached_files>\na.py\n</attached_files>\n", "\n", "\n\n", "  ", "fix the test",
+    "```python\nx = 1\n```\n", "é ü 漢字", "ok",
+]
+
+
+def random_transcript(rng: random.Random) -> str:
+    """Marker soup, a realistic transcript, or a realistic one with soup spliced in."""
+    kind = rng.random()
+    if kind < 0.4:
+        return "".join(rng.choice(_PIECES) for _ in range(rng.randint(0, 40)))
+    text = bench_corpus.transcript(rng, rng.randint(1, 4), code_lines=3)
+    if kind < 0.7:
+        return text
+    for _ in range(rng.randint(1, 4)):
+        at = rng.randint(0, len(text))
+        text = text[:at] + rng.choice(_PIECES) + text[at:]
+    return text
@@ -0,0 +1,387 @@
+"""
+Watch mode for cursor_daily_report.py (--watch): today's report is kept up to date while you
+work, so it is ready the moment the day ends.
+
+The sessions of the current work day are held in memory (DaySessions). Changes under
+CURSOR_PROJECTS/*/agent-transcripts are picked up with inotify on Linux (through ctypes, no
+extra packages) and by listing the transcript folders every POLL_SECONDS elsewhere. Only the
+transcripts that changed are parsed again; one that just grew is parsed from its last complete
+turn (see cursor_daily_report.load_transcript_turns). Once changes have settled for
+SETTLE_SECONDS, the report is rendered from memory and written if it differs; SIGUSR1 renders
+at once. When the work window ends, the finished day's report is written one last time (and
+summarized, with summarize_every) and the next day starts.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import signal
+import struct
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import cursor_daily_report as cdr
+from report_stats import STATS
+
+# Polling interval when inotify is not available.
+POLL_SECONDS = 2.0
+# Render once no transcript has changed for this long (an agent writes its answer in bursts)...
+SETTLE_SECONDS = 2.0
+# ...but at least this often while changes keep coming.
+MAX_SETTLE_SECONDS = 30.0
+# Longest wait for changes, so SIGUSR1 and the end of the work window are noticed quickly.
+WAKEUP_SECONDS = 1.0
+
+# From <sys/inotify.h>.
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_CLOEXEC = 0o2000000
+_DIR_EVENTS = _IN_CREATE | _IN_MOVED_TO | _IN_ONLYDIR
+_FILE_EVENTS = (
+    _IN_MODIFY | _IN_CLOSE_WRITE | _IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_ONLYDIR
+)
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; followed by len bytes of name
+
+
+class InotifyWatcher:
+    """
+    Transcript changes from inotify: one watch on CURSOR_PROJECTS (new projects), one per
+    project folder (new agent-transcripts folders) and one per agent-transcripts folder.
+    OSError if inotify cannot be used.
+    """
+
+    def __init__(self, root: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        self.fd = libc.inotify_init1(_IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.dirs: dict[int, tuple[str, str]] = {}  # wd -> (kind, path)
+        try:
+            self._watch("root", str(root))
+            with os.scandir(root) as projects:
+                for project_dir in projects:
+                    if project_dir.is_dir() and not project_dir.name.startswith("tmp-"):
+                        self._watch_project(project_dir.path, strict=True)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, kind: str, path: str) -> None:
+        events = _FILE_EVENTS if kind == "transcripts" else _DIR_EVENTS
+        wd = self._add_watch(self.fd, os.fsencode(path), events)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        self.dirs[wd] = (kind, path)
+        STATS.count("watch_dirs")
+
+    def _watch_project(self, path: str, strict: bool = False) -> set[Path]:
+        """Watch a project folder and its transcripts; returns the transcripts already there."""
+        try:
+            self._watch("project", path)
+            return self._watch_transcripts(os.path.join(path, "agent-transcripts"), strict)
+        except OSError:
+            if strict:
+                raise
+            return set()
+
+    def _watch_transcripts(self, path: str, strict: bool = False) -> set[Path]:
+        try:
+            self._watch("transcripts", path)
+            with os.scandir(path) as entries:
+                return {Path(e.path) for e in entries if e.name.endswith(".txt")}
+        except FileNotFoundError:
+            return set()  # created later; the project watch will see it
+        except OSError:
+            if strict:
+                raise  # e.g. ENOSPC: out of watches, so poll instead
+            return set()
+
+    def changes(self, timeout: float) -> set[Path] | None:
+        """Transcripts changed within timeout seconds (empty if none); None = rescan all."""
+        changed: set[Path] = set()
+        while select.select([self.fd], [], [], timeout)[0]:
+            buf = os.read(self.fd, 1 << 16)
+            pos = 0
+            while pos < len(buf):
+                wd, mask, _, length = _EVENT.unpack_from(buf, pos)
+                name = os.fsdecode(buf[pos + _EVENT.size:pos + _EVENT.size + length].rstrip(b"\0"))
+                pos += _EVENT.size + length
+                if mask & _IN_Q_OVERFLOW:
+                    STATS.count("watch_overflows")
+                    return None
+                kind, path = self.dirs.get(wd, (None, ""))
+                if mask & _IN_IGNORED:
+                    self.dirs.pop(wd, None)
+                elif kind == "transcripts":
+                    if name.endswith(".txt"):
+                        changed.add(Path(path, name))
+                elif not mask & _IN_ISDIR:
+                    continue
+                elif kind == "root" and not name.startswith("tmp-"):
+                    changed |= self._watch_project(os.path.join(path, name))
+                elif kind == "project" and name == "agent-transcripts":
+                    changed |= self._watch_transcripts(os.path.join(path, name))
+            timeout = 0  # drain what is queued, then return
+        STATS.count("watch_events", len(changed))
+        return changed
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """Transcript changes found by listing every agent-transcripts folder each POLL_SECONDS."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.known = self._scan()
+        self.next_poll = time.monotonic() + POLL_SECONDS
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        return {
+            txt_file: (st.st_size, st.st_mtime_ns)
+            for _, txt_file, st in cdr.iter_transcript_files()
+        }
+
+    def changes(self, timeout: float) -> set[Path] | None:
+        time.sleep(max(0.0, min(timeout, self.next_poll - time.monotonic())))
+        if time.monotonic() < self.next_poll:
+            return set()
+        self.next_poll = time.monotonic() + POLL_SECONDS
+        with STATS.stage("watch: poll"):
+            current = self._scan()
+        changed = {p for p, key in current.items() if self.known.get(p) != key}
+        changed |= self.known.keys() - current.keys()
+        self.known = current
+        STATS.count("watch_events", len(changed))
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+def open_watcher(root: Path, poll: bool = False) -> InotifyWatcher | PollingWatcher:
+    """An InotifyWatcher where possible (Linux, root exists, enough watches), else polling."""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root)
+
+
+class DaySessions:
+    """The sessions of one report date in memory, updated one transcript at a time."""
+
+    def __init__(self, report_date: datetime, start_hour: int, end_hour: int, use_cache: bool):
+        self.report_date = report_date
+        self.window = cdr.work_window(report_date, start_hour, end_hour)
+        self.use_cache = use_cache
+        self.workspace_paths = cdr.get_workspace_paths(use_cache=use_cache)
+        # transcript -> ((size, mtime_ns), row as in cdr.collect_transcripts)
+        self.sessions: dict[Path, tuple[tuple[int, int], tuple]] = {}
+
+    def _row(self, slug: str, txt_file: Path, st: os.stat_result, turns: list) -> tuple:
+        if slug not in self.workspace_paths:
+            self.workspace_paths = cdr.get_workspace_paths(use_cache=self.use_cache)
+        project_path = self.workspace_paths.get(slug) or cdr.slug_to_path(slug)
+        user_messages = [text for role, text in turns if role == "user"]
+        mtime = datetime.fromtimestamp(st.st_mtime)
+        return slug, project_path, mtime, user_messages, turns, txt_file.stem
+
+    def _in_window(self, st: os.stat_result) -> bool:
+        return self.window[0] <= datetime.fromtimestamp(st.st_mtime) < self.window[1]
+
+    def load(self, jobs: int = 1) -> None:
+        """(Re)load every transcript of the day, in a process pool if jobs > 1."""
+        with STATS.stage("scan"):
+            found = [f for f in cdr.iter_transcript_files() if self._in_window(f[2])]
+        with STATS.stage("parse"):
+            all_turns = cdr._load_all_turns([(p, st) for _, p, st in found], self.use_cache, jobs)
+        self.sessions = {}
+        for (slug, txt_file, st), turns in zip(found, all_turns):
+            if turns is not None:
+                key = (st.st_size, st.st_mtime_ns)
+                self.sessions[txt_file] = (key, self._row(slug, txt_file, st, turns))
+
+    def update(self, txt_file: Path) -> bool:
+        """Bring one transcript up to date; True if the day's sessions changed."""
+        try:
+            st = txt_file.stat()
+        except OSError:
+            return self.sessions.pop(txt_file, None) is not None
+        if not self._in_window(st):
+            return self.sessions.pop(txt_file, None) is not None
+        key = (st.st_size, st.st_mtime_ns)
+        old = self.sessions.get(txt_file)
+        if old is not None and old[0] == key:
+            return False
+        t0 = time.perf_counter()
+        try:
+            with STATS.stage("parse"):
+                turns = cdr.load_transcript_turns(txt_file, st, use_cache=self.use_cache)
+        except Exception:
+            STATS.count("files_failed")
+            return False
+        STATS.file(txt_file, time.perf_counter() - t0, st.st_size)
+        STATS.count("watch_files_parsed")
+        slug = txt_file.parent.parent.name
+        self.sessions[txt_file] = (key, self._row(slug, txt_file, st, turns))
+        return True
+
+    def rows(self) -> list[tuple]:
+        return [row for _, row in self.sessions.values()]
+
+
+def current_report_date(now: datetime, start_hour: int, end_hour: int) -> datetime:
+    """The report date whose work window contains now, or else the next one to start."""
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    for report_date in (day - timedelta(days=1), day, day + timedelta(days=1)):
+        if now < cdr.work_window(report_date, start_hour, end_hour)[1]:
+            return report_date
+    return day + timedelta(days=2)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp_path = path.with_name(path.name + ".part")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def watch(
+    out_dir: Path,
+    start_hour: int = 3,
+    end_hour: int = 1,
+    use_cache: bool = True,
+    jobs: int = 1,
+    summarize_every: float = 0,
+    poll: bool = False,
+    **render_options,
+) -> None:
+    """
+    Keep out_dir/cursor-report-YYYY-MM-DD.md up to date until interrupted. render_options go
+    to cdr.build_report (max_first_message_chars, compact, dedupe, delta). With
+    summarize_every > 0, summary-report-YYYY-MM-DD.md is refreshed at most every that many
+    minutes while the report changes, and once more when the work day ends.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    summary = None
+    if summarize_every > 0:
+        import summary_report  # only loaded when summaries are wanted
+
+        summary_report.load_dotenv(Path(__file__).resolve().parent / ".env")
+        api_key = os.environ.get("GEMINI_API_KEY")
+        if not api_key:
+            print("Set GEMINI_API_KEY in .env to keep a summary; watching the report only.",
+                  file=sys.stderr)
+        else:
+            summary = {"key": api_key, "at": float("-inf"), "report": None}
+
+    requested = []
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda *_: requested.append(True))
+
+    watcher = open_watcher(cdr.CURSOR_PROJECTS, poll=poll)
+    print(f"Watching {cdr.CURSOR_PROJECTS} ({type(watcher).__name__}); Ctrl-C to stop.",
+          file=sys.stderr)
+    day = DaySessions(
+        current_report_date(datetime.now(), start_hour, end_hour), start_hour, end_hour, use_cache
+    )
+    day.load(jobs)
+    written = None
+    pending: set[Path] = set()
+    first_change = last_change = 0.0
+
+    def render(final: bool = False) -> None:
+        nonlocal written
+        report = cdr.build_report(
+            day.report_date, start_hour, end_hour, rows=day.rows(), **render_options
+        )
+        day_str = day.report_date.strftime("%Y-%m-%d")
+        out_path = out_dir / f"cursor-report-{day_str}.md"
+        if report != written:
+            with STATS.stage("write"):
+                _write_atomic(out_path, report)
+            written = report
+            STATS.count("watch_renders")
+            print(f"{datetime.now():%H:%M:%S} report updated: {out_path} "
+                  f"({len(day.sessions)} chats)", flush=True)
+        if summary is None or not day.sessions or report == summary["report"]:
+            return
+        if not final and time.monotonic() - summary["at"] < summarize_every * 60:
+            return
+        import summary_report
+
+        summary["at"] = time.monotonic()
+        try:
+            summary_report.summarize_report(
+                report, day_str, out_dir / f"summary-report-{day_str}.md", summary["key"],
+                use_cache=use_cache,
+            )
+        except SystemExit as e:
+            print(f"Summary failed: {e.code}", file=sys.stderr)
+            return
+        summary["report"] = report
+        print(f"{datetime.now():%H:%M:%S} summary updated for {day_str}", flush=True)
+
+    try:
+        render()
+        while True:
+            if datetime.now() >= day.window[1]:
+                for txt_file in pending:
+                    day.update(txt_file)
+                pending.clear()
+                render(final=True)
+                day = DaySessions(
+                    day.report_date + timedelta(days=1), start_hour, end_hour, use_cache
+                )
+                day.load(jobs)
+                written = None
+                render()
+                continue
+            until_end = (day.window[1] - datetime.now()).total_seconds()
+            changed = watcher.changes(max(0.0, min(WAKEUP_SECONDS, until_end)))
+            now = time.monotonic()
+            dirty = False
+            if changed is None:
+                day.load(jobs)
+                pending.clear()
+                dirty = True
+            elif changed:
+                if not pending:
+                    first_change = now
+                pending |= changed
+                last_change = now
+            if pending and (requested or now - last_change >= SETTLE_SECONDS
+                            or now - first_change >= MAX_SETTLE_SECONDS):
+                for txt_file in pending:
+                    dirty |= day.update(txt_file)
+                pending.clear()
+            if dirty or requested:
+                requested.clear()
+                render()
+    except KeyboardInterrupt:
+        for txt_file in pending:
+            day.update(txt_file)
+        render()
+    finally:
+        watcher.close()